@@ -1,14 +1,21 @@
 import multiprocessing
 
 import concurrent.futures
+import itertools
 import os
 import pandas as pd
 import math
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from year_partitions import YearPartitions
+
+partition_format = "parquet"
 
 
 def get_year_statistics(file_name, job_name, ):
-    year = file_name[-8:-4]
-    df = pd.read_csv(file_name)
+    year = os.path.splitext(file_name)[0][-4:]
+    df = YearPartitions.read_part(file_name, ["name", "salary_from", "salary_to"])
     df["mean_salary"] = 0.5 * (df["salary_from"] + df["salary_to"])
     salaries_year = int(df["mean_salary"].mean())
     vacancies_count_year = df.shape[0]
@@ -19,23 +26,11 @@ def get_year_statistics(file_name, job_name, ):
     return [year, salaries_year, vacancies_count_year, job_salary_years, job_vacancies_count_year]
 
 
-def separate_csv(file_name):
-    df = pd.read_csv(file_name)
-    df["years"] = df["published_at"].apply(lambda s: s[0:4])
-    years = df["years"].unique()
-
-    if not os.path.exists("csv_files"):
-        os.mkdir("csv_files")
-    for year in years:
-        data = df[df["years"] == year]
-        data.iloc[:, :6].to_csv(rf"csv_files\part_{year}.csv", index=False)
-
-
-def get_multiprocess_statistics(job_name):
-    files_count = len([x for x in os.listdir("csv_files")])
-    with concurrent.futures.ThreadPoolExecutor(max_workers=files_count) as executor:
-        futures = [executor.submit(get_year_statistics, os.path.join("csv_files", file_name), job_name) for file_name in os.listdir("csv_files")]
-    output = [future.result() for future in concurrent.futures.as_completed(futures)]
+def get_multiprocess_statistics(job_name, file_format="csv", max_workers=None, chunk_size=1):
+    file_names = [os.path.join("csv_files", x) for x in os.listdir("csv_files") if x.endswith(f".{file_format}")]
+    max_workers = max(1, min(max_workers or os.cpu_count(), len(file_names)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        output = list(executor.map(get_year_statistics, file_names, itertools.repeat(job_name), chunksize=chunk_size))
     result = [{} for x in range(4)]
     for year_data in output:
         for i in range(4):
@@ -97,8 +92,8 @@ if __name__ == "__main__":
         "Программист"
     ]
 
-    separate_csv(user_input[0])
-    multiproc_result = get_multiprocess_statistics(user_input[1])
+    YearPartitions.separate_csv(user_input[0], file_format=partition_format)
+    multiproc_result = get_multiprocess_statistics(user_input[1], partition_format)
     singleproc_result = get_singleprocess_statistics(user_input[0])
     print(f"Динамика уровня зарплат по годам: {multiproc_result[0]}")
     print(f"Динамика количества вакансий по годам: {multiproc_result[1]}")
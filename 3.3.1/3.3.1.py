@@ -1,46 +1,122 @@
+import concurrent.futures
+import csv
+import datetime
+import os
+import xml.etree.ElementTree as ET
 import pandas as pd
 import requests
-import lxml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 pd.set_option("expand_frame_repr", False)
 
-df = pd.read_csv("vacancies_dif_currencies.csv")
-published_at_dates = df.loc[:, "published_at"]
-
-oldest_record_publication_month = published_at_dates.min()[5:7]
-latest_record_publication_month = published_at_dates.max()[5:7]
-
-proper_currencies = [x for x in df
-    .groupby("salary_currency")
-    .size()
-    .loc[lambda freq: freq >= 5000]
-    .index
-    .values if x != "RUR"]
-
-result = pd.DataFrame(columns=["date"] + proper_currencies)
-
-to_get_currencies_exchanges_dates = [
-    f"{f'0{month}' if month in range(1, 9 + 1) else month}/{year}" for year in range(2003, 2022 + 1)
-    for month in range(int(oldest_record_publication_month) if year == 2003 else 1,
-                       int(latest_record_publication_month) if year == 2022 else 12 + 1)
-]
-
-if "BYR" in proper_currencies and "BYN" not in proper_currencies:
-    proper_currencies.append("BYN")
-elif "BYN" in proper_currencies:
-    proper_currencies.append("BYR")
-
-
-for i in range(len(to_get_currencies_exchanges_dates)):
-    date = to_get_currencies_exchanges_dates[i]
-    url = f"https://www.cbr.ru/scripts/XML_daily.asp?date_req=15/{date}d=1"
-    response = requests.get(url)
-    cur_df = pd.read_xml(response.text)
-    cur_filtered_df = cur_df.loc[cur_df['CharCode'].isin(proper_currencies)]
-    values = cur_filtered_df["Value"].apply(lambda x: float(x.replace(",", ".")))
-    nominals = cur_filtered_df["Nominal"]
-    exchanges = values / nominals
-    result.loc[i] = [date.replace("/", "-")] + [x for x in exchanges]
-
-result = result.set_index(result.loc[:, "date"])
-result.to_csv("cb_currencies.csv", index=False)
\ No newline at end of file
+cb_url = "https://www.cbr.ru/scripts/XML_daily.asp"
+responses_directory = "cb_responses"
+
+
+def get_month_number(date):
+    return int(date[3:7]) * 12 + int(date[0:2]) - 1
+
+
+def get_month_date(month_number):
+    return f"{month_number % 12 + 1:02d}/{month_number // 12}"
+
+
+def get_latest_published_month(today=None):
+    today = today or datetime.date.today()
+    month_number = today.year * 12 + today.month - 1
+    return month_number if today.day >= 15 else month_number - 1
+
+
+def get_session(workers_count, retries_count=5, backoff_factor=0.5):
+    session = requests.Session()
+    retry = Retry(total=retries_count, backoff_factor=backoff_factor, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers_count, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_month_response(session, date, url=cb_url, directory=responses_directory):
+    file_name = os.path.join(directory, f"{date.replace('/', '-')}.xml")
+    if os.path.exists(file_name):
+        with open(file_name, "rb") as file:
+            return file.read()
+    response = session.get(f"{url}?date_req=15/{date}d=1", timeout=30)
+    response.raise_for_status()
+    with open(f"{file_name}.tmp", "wb") as file:
+        file.write(response.content)
+    os.replace(f"{file_name}.tmp", file_name)
+    return response.content
+
+
+def get_months_responses(dates, url=cb_url, directory=responses_directory, workers_count=8):
+    os.makedirs(directory, exist_ok=True)
+    with get_session(workers_count) as session, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
+        return list(executor.map(lambda date: get_month_response(session, date, url, directory), dates))
+
+
+def parse_exchanges(response, currencies):
+    exchanges = {}
+    for valute in ET.fromstring(response).iter("Valute"):
+        value = float(valute.findtext("Value").replace(",", "."))
+        exchanges[valute.findtext("CharCode")] = value / int(valute.findtext("Nominal"))
+    if "BYR" not in exchanges and "BYN" in exchanges:
+        exchanges["BYR"] = exchanges["BYN"]
+    elif "BYN" not in exchanges and "BYR" in exchanges:
+        exchanges["BYN"] = exchanges["BYR"]
+    return [exchanges.get(currency) for currency in currencies]
+
+
+def get_currencies_exchanges(dates, currencies, url=cb_url, directory=responses_directory, workers_count=8):
+    responses = get_months_responses(dates, url, directory, workers_count)
+    rows = [[date.replace("/", "-")] + parse_exchanges(response, currencies) for date, response in zip(dates, responses)]
+    return pd.DataFrame(rows, columns=["date"] + currencies)
+
+
+def update_currencies_exchanges(file_name, until_month=None, url=cb_url, directory=responses_directory,
+                                workers_count=8):
+    with open(file_name, encoding="utf_8_sig", newline="") as file:
+        reader = csv.reader(file)
+        currencies = next(reader)[1:]
+        last_month = max((get_month_number(row[0]) for row in reader if len(row) > 0), default=None)
+    if last_month is None:
+        raise ValueError(f"В файле {file_name} нет ни одного месяца")
+    until_month = get_latest_published_month() if until_month is None else until_month
+    dates = [get_month_date(month_number) for month_number in range(last_month + 1, until_month + 1)]
+    if len(dates) == 0:
+        return 0
+    result = get_currencies_exchanges(dates, currencies, url, directory, workers_count)
+    result.to_csv(file_name, mode="a", header=False, index=False)
+    return len(result)
+
+
+def get_all_currencies_exchanges(file_name, url=cb_url, directory=responses_directory, workers_count=8):
+    df = pd.read_csv(file_name)
+    published_at_dates = df.loc[:, "published_at"]
+
+    oldest_record_publication_month = published_at_dates.min()[5:7]
+    latest_record_publication_month = published_at_dates.max()[5:7]
+
+    proper_currencies = [x for x in df
+        .groupby("salary_currency")
+        .size()
+        .loc[lambda freq: freq >= 5000]
+        .index
+        .values if x != "RUR"]
+
+    to_get_currencies_exchanges_dates = [
+        f"{f'0{month}' if month in range(1, 9 + 1) else month}/{year}" for year in range(2003, 2022 + 1)
+        for month in range(int(oldest_record_publication_month) if year == 2003 else 1,
+                           int(latest_record_publication_month) if year == 2022 else 12 + 1)
+    ]
+
+    return get_currencies_exchanges(to_get_currencies_exchanges_dates, proper_currencies, url, directory, workers_count)
+
+
+if __name__ == "__main__":
+    if os.path.exists("cb_currencies.csv"):
+        update_currencies_exchanges("cb_currencies.csv")
+    else:
+        get_all_currencies_exchanges("vacancies_dif_currencies.csv").to_csv("cb_currencies.csv", index=False)
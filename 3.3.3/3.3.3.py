@@ -1,56 +1,189 @@
-import pandas as pd
+import concurrent.futures
+import csv
+import json
+import os
+import threading
+import time
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta
 
-pd.set_option("expand_frame_repr", False)
+vacancies_url = "https://api.hh.ru/vacancies"
+vacancies_limit = 2000
+date_format = '%Y-%m-%dT%H:%M:%S'
+vacancies_columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+
+
+class RateLimiter:
+    def __init__(self, requests_per_second):
+        self.interval = 1 / requests_per_second
+        self.next_request_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            request_time = max(now, self.next_request_time)
+            self.next_request_time = request_time + self.interval
+        time.sleep(request_time - now)
 
 
 def get_request_dates(date: str):
-    request_dates = []
-    input_date = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S%z')
-    for i in range(4):
-        request_dates.append(input_date.replace(hour=i * 6, minute=0, second=0).strftime('%Y-%m-%dT%H:%M:%S'))
-    request_dates.append(input_date.replace(hour=23, minute=59, second=59).strftime('%Y-%m-%dT%H:%M:%S'))
-    return request_dates
-
-
-def get_json(page_number: int, start_date: str, end_date: str):
-    while True:
-        response = requests.get(
-            f"https://api.hh.ru/vacancies?date_from={start_date}&date_to={end_date}&specialization=1&per_page=100&page={page_number}")
-        if response.status_code == 200:
-            return response.json()
-
-
-def get_vacancies_info(start_date: str, end_date: str):
-    vacancies_info = []
-    response_json = requests.get(
-        f"https://api.hh.ru/vacancies?date_from={start_date}&date_to={end_date}&specialization=1&per_page=100").json()
-    pages = response_json["pages"]
-    for page_number in range(pages):
-        vacancies_info_page_json = get_json(page_number, start_date, end_date)
-        for vacancy_info in vacancies_info_page_json["items"]:
-            vacancies_info.append({
-                "name": vacancy_info["name"],
-                "salary_from": vacancy_info["salary"]["from"] if vacancy_info["salary"] else None,
-                "salary_to": vacancy_info["salary"]["to"] if vacancy_info["salary"] else None,
-                "salary_currency": vacancy_info["salary"]["currency"] if vacancy_info["salary"] else None,
-                "area_name": vacancy_info["area"]["name"],
-                "published_at": vacancy_info["published_at"]
-            })
-    return vacancies_info
-
-
-def get_full_day_vacancies_info(request_dates: list[str]):
-    if len(request_dates) == 0:
-        return
-    full_day_vacancies_info = []
-    for i in range(1, len(request_dates)):
-        full_day_vacancies_info += get_vacancies_info(request_dates[i - 1], request_dates[i])
-    return full_day_vacancies_info
-
-
-request_dates = get_request_dates('2022-12-12T12:12:12+0300')
-vacancies_info = get_full_day_vacancies_info(request_dates)
-df = pd.DataFrame.from_dict(vacancies_info)
-df.to_csv("hh_api_vacancies.csv")
+    return [f"{date[0:10]}T00:00:00", f"{date[0:10]}T23:59:59"]
+
+
+def split_window(start_date: str, end_date: str):
+    start = datetime.fromisoformat(start_date)
+    end = datetime.fromisoformat(end_date)
+    if end - start < timedelta(seconds=1):
+        return None
+    middle = start + timedelta(seconds=(end - start).total_seconds() // 2)
+    return [(start_date, middle.strftime(date_format)),
+            ((middle + timedelta(seconds=1)).strftime(date_format), end_date)]
+
+
+def get_session(workers_count):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers_count)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_json(session, rate_limiter, page_number: int, start_date: str, end_date: str, url=vacancies_url,
+             retries_count=8, backoff_factor=0.5):
+    params = {"date_from": start_date, "date_to": end_date, "specialization": 1, "per_page": 100, "page": page_number}
+    for attempt in range(retries_count + 1):
+        rate_limiter.wait()
+        try:
+            response = session.get(url, params=params, timeout=30)
+            if response.status_code == 200:
+                return response.json()
+        except requests.RequestException:
+            pass
+        if attempt < retries_count:
+            time.sleep(backoff_factor * 2 ** attempt)
+    raise RuntimeError(f"Не удалось получить страницу {page_number} за период {start_date} - {end_date}")
+
+
+def get_vacancies_rows(vacancies_info_page_json):
+    return [[
+        vacancy_info["name"],
+        vacancy_info["salary"]["from"] if vacancy_info["salary"] else None,
+        vacancy_info["salary"]["to"] if vacancy_info["salary"] else None,
+        vacancy_info["salary"]["currency"] if vacancy_info["salary"] else None,
+        vacancy_info["area"]["name"],
+        vacancy_info["published_at"]
+    ] for vacancy_info in vacancies_info_page_json["items"]]
+
+
+def read_checkpoint(checkpoint_file_name):
+    checkpoint = {"windows": {}, "completed_pages": set(), "file_size": 0, "rows_count": 0, "checkpoint_size": 0}
+    if not os.path.exists(checkpoint_file_name):
+        return checkpoint
+    planned = False
+    with open(checkpoint_file_name, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            entry = json.loads(line)
+            if "planned" in entry:
+                planned = True
+            elif "pages" in entry:
+                checkpoint["windows"][tuple(entry["window"])] = entry["pages"]
+            else:
+                checkpoint["completed_pages"].add((*entry["window"], entry["page"]))
+                checkpoint["file_size"] = entry["file_size"]
+                checkpoint["rows_count"] = entry["rows_count"]
+            checkpoint["checkpoint_size"] += len(line)
+    if not planned:
+        checkpoint["windows"] = {}
+        checkpoint["checkpoint_size"] = 0
+    return checkpoint
+
+
+def crawl_vacancies(request_dates: list[str], file_name, checkpoint_file_name=None, url=vacancies_url,
+                    workers_count=4, requests_per_second=5, retries_count=8, backoff_factor=0.5):
+    checkpoint_file_name = checkpoint_file_name or f"{file_name}.checkpoint"
+    checkpoint = read_checkpoint(checkpoint_file_name)
+    windows = checkpoint["windows"]
+    completed_pages = checkpoint["completed_pages"]
+    rows_count = checkpoint["rows_count"]
+    rate_limiter = RateLimiter(requests_per_second)
+    written_rows_count = 0
+
+    for name, size in [(file_name, checkpoint["file_size"]), (checkpoint_file_name, checkpoint["checkpoint_size"])]:
+        if os.path.exists(name):
+            os.truncate(name, size)
+
+    with get_session(workers_count) as session, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers_count) as executor, \
+            open(file_name, "a", encoding="utf_8", newline="") as file, \
+            open(checkpoint_file_name, "a", encoding="utf_8") as checkpoint_file:
+        writer = csv.writer(file)
+        if file.tell() == 0:
+            writer.writerow(["", *vacancies_columns])
+
+        def write_checkpoint(entry):
+            checkpoint_file.write(json.dumps(entry) + "\n")
+            checkpoint_file.flush()
+
+        def get_page(window_page):
+            (start_date, end_date), page_number = window_page
+            return get_json(session, rate_limiter, page_number, start_date, end_date, url, retries_count, backoff_factor)
+
+        def write_page(window, page_number, page_json):
+            nonlocal rows_count, written_rows_count
+            rows = get_vacancies_rows(page_json)
+            writer.writerows([rows_count + i, *row] for i, row in enumerate(rows))
+            file.flush()
+            rows_count += len(rows)
+            write_checkpoint({"window": window, "page": page_number, "file_size": file.tell(), "rows_count": rows_count})
+            written_rows_count += len(rows)
+
+        def fetch_pages(window_pages):
+            futures = {executor.submit(get_page, window_page): window_page for window_page in window_pages}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    page_json = future.result()
+                except RuntimeError as error:
+                    errors.append(error)
+                    continue
+                window, page_number = futures[future]
+                write_page(window, page_number, page_json)
+
+        # Окна только делятся пополам и не объединяются: первая страница каждого окна уже загружена при проверке,
+        # поэтому объединение соседних редких окон потребовало бы новых запросов, а не сэкономило бы их
+        def plan_windows(windows):
+            first_pages = []
+            while len(windows) > 0:
+                next_windows = []
+                for window, page_json in zip(windows, executor.map(get_page, [(window, 0) for window in windows])):
+                    halves = split_window(*window) if page_json["found"] > vacancies_limit else None
+                    if halves is None:
+                        first_pages.append((window, page_json))
+                    else:
+                        next_windows += halves
+                windows = next_windows
+            first_pages.sort(key=lambda window_page: window_page[0])
+            for window, page_json in first_pages:
+                write_checkpoint({"window": window, "pages": page_json["pages"]})
+            write_checkpoint({"planned": True})
+            return first_pages
+
+        errors = []
+        if len(windows) == 0:
+            for window, page_json in plan_windows([(request_dates[0], request_dates[-1])]):
+                windows[window] = page_json["pages"]
+                write_page(window, 0, page_json)
+                completed_pages.add((*window, 0))
+        fetch_pages([(window, page_number) for window, pages_count in windows.items()
+                     for page_number in range(pages_count) if (*window, page_number) not in completed_pages])
+    if len(errors) > 0:
+        raise errors[0]
+    return written_rows_count
+
+
+if __name__ == "__main__":
+    request_dates = get_request_dates('2022-12-12T12:12:12+0300')
+    crawl_vacancies(request_dates, "hh_api_vacancies.csv")
@@ -1,92 +1,80 @@
 import pandas as pd
-from statistics import mean
-import math
 import concurrent.futures
+import itertools
 import os
+import sys
 import matplotlib.pyplot as plt
 from matplotlib.ticker import IndexLocator
 from jinja2 import Environment, FileSystemLoader
 import pdfkit
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from exchange_rates import ExchangeRates
+from year_partitions import YearPartitions
+from keyword_matcher import KeywordMatcher
+from main import FileHandler
+
 pd.set_option("expand_frame_repr", False)
+partition_format = "parquet"
+
+
+"""
+Метод для однократной передачи таблицы курсов валют процессу-обработчику при его запуске
+"""
+def init_year_statistics_worker(rates):
+    global exchange_rates
+    exchange_rates = rates
 
 
 """
-Метод для обработки заработной платы: 
--возврат необходимого значения в зависимости от того, какие значения принимают поля salary_from, salary_to; 
--преобразование в рубли при необходимости
+Метод для подсчета сумм и количеств по профессиям (и группам строк, например годам).
+Названия кодируются один раз, каждое уникальное название размечается сразу всеми профессиями автоматом Ахо-Корасик
 """
-def handle_salary(dates, date, salary_from, salary_to, salary_currency):
-    currency_exchange = 0
-    if salary_currency in ["BYN", "BYR", "EUR", "KZT", "UAH", "USD"]:
-        salary_currency.replace("BYN", "BYR")
-        date = f"{date[1]}-{date[0]}"
-        df_date_row = dates.loc[df_dates["date"] == date]
-        currency_exchange = df_date_row[salary_currency].values[0]
-    elif salary_currency == "RUR":
-        currency_exchange = 1
-
-    if not (math.isnan(salary_from)) and not (math.isnan(salary_to)):
-        mean([salary_from, salary_to]) * currency_exchange
-    elif not (math.isnan(salary_from)):
-        return salary_from * currency_exchange
-    else:
-        return salary_to * currency_exchange
+def get_jobs_grouped_sums(names, job_names, values, groups_codes=None, groups_count=1):
+    names_codes, unique_names = pd.factorize(names.fillna(""))
+    return KeywordMatcher(job_names).get_grouped_sums(unique_names.tolist(), names_codes, values, groups_codes,
+                                                      groups_count)
 
 
 """
-Метод для получения статистики за отдельно взятый год
+Метод для получения статистики за отдельно взятый год сразу для нескольких профессий.
+Таблица курсов валют берется из глобальной переменной, заданной при запуске процесса
 """
-def get_year_statistics(file_name, job_name, dates):
-    year = file_name[-8:-4]
-    df = pd.read_csv(file_name)
-    df["salary"] = df.apply(lambda row:
-                            handle_salary(dates,
-                                          row["published_at"][:7].split("-"),
-                                          row["salary_from"],
-                                          row["salary_to"],
-                                          row["salary_currency"]),
-                            axis=1)
+def get_year_statistics(file_name, job_names):
+    year = os.path.splitext(file_name)[0][-4:]
+    df = YearPartitions.read_part(file_name, ["name", "salary_from", "salary_to", "salary_currency", "published_at"])
+    df["salary"] = exchange_rates.convert_salaries(df["salary_from"], df["salary_to"], df["published_at"],
+                                                   df["salary_currency"])
 
     df = df[df["salary"].notnull()]
     salaries_year = int(df["salary"].mean())
     vacancies_count_year = df.shape[0]
-    job_dataframe = df[df["name"].str.contains(job_name)]
-    job_salary_year = int(job_dataframe["salary"].mean())
-    job_vacancies_count_year = job_dataframe.shape[0]
+    jobs_sums, jobs_counts = get_jobs_grouped_sums(df["name"], job_names, df["salary"].to_numpy())
+    job_salary_year = {}
+    job_vacancies_count_year = {}
+    for job_name, job_sum, job_count in zip(job_names, jobs_sums[:, 0].tolist(), jobs_counts[:, 0].tolist()):
+        job_salary_year[job_name] = int(job_sum / job_count) if job_count > 0 else 0
+        job_vacancies_count_year[job_name] = job_count
     return [year, salaries_year, vacancies_count_year, job_salary_year, job_vacancies_count_year]
 
-"""
-Метод для разделения исходного файла на более мелкие по годам
-"""
-def separate_csv(file_name):
-    df = pd.read_csv(file_name)
-    df["years"] = df["published_at"].apply(lambda s: s[0:4])
-    years = df["years"].unique()
-
-    if not os.path.exists("csv_files"):
-        os.mkdir("csv_files")
-    for year in years:
-        data = df[df["years"] == year]
-        data.iloc[:, :6].to_csv(rf"csv_files\part_{year}.csv", index=False)
 
 """
 Метод для многопроцессорной обработки данных по годам
 """
-def get_multiprocess_statistics(job_name, dates):
-    files_count = len([x for x in os.listdir("csv_files")])
-    with concurrent.futures.ThreadPoolExecutor(max_workers=files_count) as executor:
-        futures = [executor.submit(get_year_statistics, os.path.join("csv_files", file_name), job_name, dates) for
-                   file_name in
-                   os.listdir("csv_files")]
-    output = [future.result() for future in concurrent.futures.as_completed(futures)]
-    result = [{} for _ in range(4)]
-    for year_data in output:
-        for i in range(4):
-            result[i][year_data[0]] = year_data[i + 1]
-
-    for i in range(len(result)):
-        result[i] = dict(sorted(result[i].items(), key=lambda x: x[0]))
+def get_multiprocess_statistics(job_names, exchange_rates, file_format="csv", max_workers=None, chunk_size=1):
+    file_names = [os.path.join("csv_files", x) for x in os.listdir("csv_files") if x.endswith(f".{file_format}")]
+    max_workers = max(1, min(max_workers or os.cpu_count(), len(file_names)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                initializer=init_year_statistics_worker,
+                                                initargs=(exchange_rates,)) as executor:
+        output = list(executor.map(get_year_statistics, file_names, itertools.repeat(job_names), chunksize=chunk_size))
+    result = [{}, {}, {job_name: {} for job_name in job_names}, {job_name: {} for job_name in job_names}]
+    for year_data in sorted(output, key=lambda x: x[0]):
+        result[0][year_data[0]] = year_data[1]
+        result[1][year_data[0]] = year_data[2]
+        for job_name in job_names:
+            result[2][job_name][year_data[0]] = year_data[3][job_name]
+            result[3][job_name][year_data[0]] = year_data[4][job_name]
     return result
 
 
@@ -118,6 +106,7 @@ class Report:
         ax[1, 1].axis('off')
         plt.tight_layout()
         plt.savefig("graph.png")
+        plt.close(fig)
 
     """
     Метод, отвечающий за отрисовку графика, включающего в себя данные об уровне зарплат по годам в целом и для выбранной профессии 
@@ -168,7 +157,7 @@ class Report:
     """
     Метод, отвечающий за генерацию отчета в формате .pdf
     """
-    def generate_pdf(self):
+    def generate_pdf(self, file_name="report.pdf"):
         env = Environment(loader=FileSystemLoader("."))
         template = env.get_template("pdf_template.html")
 
@@ -183,24 +172,26 @@ class Report:
              "job_years_vacancies": self.job_years_vacancies,
              "years_headers": years_headers})
         config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": None})
+        pdfkit.from_string(pdf_template, file_name, configuration=config, options={"enable-local-file-access": None})
 
 
 if __name__ == "__main__":
     file_name = input("Введите название файла: ")
-    job_name = input("Введите название профессии: ")
+    # Можно ввести несколько профессий через запятую: общие данные считаются один раз, отчеты строятся для каждой
+    job_names = FileHandler.get_job_names(input("Введите название профессии: "))
 
-    separate_csv(file_name)
-    df_dates = pd.read_csv("cb_currencies.csv")
+    YearPartitions.separate_csv(file_name, file_format=partition_format)
+    exchange_rates = ExchangeRates.from_csv("cb_currencies.csv")
 
-    output_data = get_multiprocess_statistics(job_name, df_dates)
+    output_data = get_multiprocess_statistics(job_names, exchange_rates, partition_format)
 
-    print(f"Динамика уровня зарплат по годам: {output_data[0]}")
-    print(f"Динамика количества вакансий по годам: {output_data[2]}")
-    print(f"Динамика уровня зарплат по годам для выбранной профессии: {output_data[1]}")
-    print(f"Динамика количества вакансий по годам для выбранной профессии: {output_data[3]}")
+    for i, job_name in enumerate(job_names):
+        print(f"Динамика уровня зарплат по годам: {output_data[0]}")
+        print(f"Динамика количества вакансий по годам: {output_data[2][job_name]}")
+        print(f"Динамика уровня зарплат по годам для выбранной профессии: {output_data[1]}")
+        print(f"Динамика количества вакансий по годам для выбранной профессии: {output_data[3][job_name]}")
 
-    report = Report(job_name, output_data[0], output_data[2], output_data[1], output_data[3])
-    report.render_graph()
-    report.generate_pdf()
+        report = Report(job_name, output_data[0], output_data[2][job_name], output_data[1], output_data[3][job_name])
+        report.render_graph()
+        report.generate_pdf("report.pdf" if len(job_names) == 1 else f"report_{i + 1}.pdf")
 
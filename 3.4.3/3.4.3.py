@@ -1,90 +1,74 @@
 import pandas as pd
-from statistics import mean
-import math
 import concurrent.futures
+import itertools
 import os
+import sys
 import matplotlib.pyplot as plt
 from matplotlib.ticker import IndexLocator
 from jinja2 import Environment, FileSystemLoader
 import pdfkit
 import re
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from exchange_rates import ExchangeRates
+from year_partitions import YearPartitions
+from keyword_matcher import KeywordMatcher
+from main import FileHandler
+
 pd.set_option("expand_frame_repr", False)
+partition_format = "parquet"
 
 
 """
-Метод для обработки заработной платы: 
--возврат необходимого значения в зависимости от того, какие значения принимают поля salary_from, salary_to; 
--преобразование в рубли при необходимости
+Метод для однократной передачи таблицы курсов валют процессу-обработчику при его запуске
 """
-def handle_salary(dates_currencies, date, salary_from, salary_to, salary_currency):
-    currency_exchange = 0
-    if salary_currency in ["BYN", "BYR", "EUR", "KZT", "UAH", "USD"]:
-        salary_currency.replace("BYN", "BYR")
-        date = f"{date[1]}-{date[0]}"
-        df_date_row = dates_currencies.loc[df_dates_currencies["date"] == date]
-        currency_exchange = df_date_row[salary_currency].values[0]
-    elif salary_currency == "RUR":
-        currency_exchange = 1
-
-    if not (math.isnan(salary_from)) and not (math.isnan(salary_to)):
-        mean([salary_from, salary_to]) * currency_exchange
-    elif not (math.isnan(salary_from)):
-        return salary_from * currency_exchange
-    else:
-        return salary_to * currency_exchange
+def init_year_statistics_worker(rates):
+    global exchange_rates
+    exchange_rates = rates
 
 
 """
-Метод для получения статистики за отдельно взятый год
+Метод для подсчета сумм и количеств по профессиям (и группам строк, например годам).
+Названия кодируются один раз, каждое уникальное название размечается сразу всеми профессиями автоматом Ахо-Корасик
 """
-def get_year_statistics(file_name, job_name, dates):
-    year = file_name[-8:-4]
-    df = pd.read_csv(file_name)
-    df["salary"] = df.apply(lambda row:
-                            handle_salary(dates,
-                                          row["published_at"][:7].split("-"),
-                                          row["salary_from"],
-                                          row["salary_to"],
-                                          row["salary_currency"]),
-                            axis=1)
+def get_jobs_grouped_sums(names, job_names, values, groups_codes=None, groups_count=1):
+    names_codes, unique_names = pd.factorize(names.fillna(""))
+    return KeywordMatcher(job_names).get_grouped_sums(unique_names.tolist(), names_codes, values, groups_codes,
+                                                      groups_count)
 
-    df = df[df["salary"].notnull()]
-    year_salaries = int(df["salary"].mean())
-    year_vacancies_count = df.shape[0]
-    job_dataframe = df[df["name"].str.contains(job_name)]
-    year_job_salaries = int(job_dataframe["salary"].mean())
-    year_job_vacancies_count = job_dataframe.shape[0]
-    return [year, year_salaries, year_vacancies_count, year_job_salaries, year_job_vacancies_count]
 
 """
-Метод для разделения исходного файла на более мелкие по годам
+Метод для получения статистики за отдельно взятый год сразу для нескольких профессий.
+Таблица курсов валют берется из глобальной переменной, заданной при запуске процесса
 """
-def separate_csv(file_name):
-    df = pd.read_csv(file_name)
-    df["years"] = df["published_at"].apply(lambda s: s[0:4])
-    years = df["years"].unique()
+def get_year_statistics(file_name, job_names):
+    year = os.path.splitext(file_name)[0][-4:]
+    df = YearPartitions.read_part(file_name, ["name", "salary_from", "salary_to", "salary_currency", "published_at"])
+    df["salary"] = exchange_rates.convert_salaries(df["salary_from"], df["salary_to"], df["published_at"],
+                                                   df["salary_currency"])
+
+    df = df[df["salary"].notnull()]
+    year_salaries = int(df["salary"].mean())
+    year_vacancies_count = df.shape[0]
+    jobs_sums, jobs_counts = get_jobs_grouped_sums(df["name"], job_names, df["salary"].to_numpy())
+    years_job_salaries = {}
+    years_job_vacancies_count = {}
+    for job_name, job_sum, job_count in zip(job_names, jobs_sums[:, 0].tolist(), jobs_counts[:, 0].tolist()):
+        years_job_salaries[job_name] = int(job_sum / job_count) if job_count > 0 else 0
+        years_job_vacancies_count[job_name] = job_count
+    return [year, year_salaries, year_vacancies_count, years_job_salaries, years_job_vacancies_count]
 
-    if not os.path.exists("csv_files"):
-        os.mkdir("csv_files")
-    for year in years:
-        data = df[df["years"] == year]
-        data.iloc[:, :6].to_csv(rf"csv_files\part_{year}.csv", index=False)
 
 """
-Метод для однопроцессной обработки данных о зарплатах по городам
+Метод для однопроцессной обработки данных о зарплатах по городам.
+Данные по городам считаются один раз, данные по годам для региона - для каждой профессии
 """
-def get_singleprocess_statistics(file_name, job_name, area_name, dates_currencies):
+def get_singleprocess_statistics(file_name, job_names, area_name, exchange_rates):
     df = pd.read_csv(file_name)
-    df["year"] = df.apply(lambda row: row["published_at"][0:4], axis=1)
+    df["year"] = df["published_at"].str[0:4]
     years = df["year"].unique()
-    df["salary"] = df.apply(lambda row:
-                            handle_salary(dates_currencies,
-                                          row["published_at"][:7].split("-"),
-                                          row["salary_from"],
-                                          row["salary_to"],
-                                          row["salary_currency"]),
-                            axis=1)
+    df["salary"] = exchange_rates.convert_salaries(df["salary_from"], df["salary_to"], df["published_at"],
+                                                   df["salary_currency"])
     df = df[df["salary"].notnull()]
     df["count"] = df.groupby("area_name")["area_name"].transform("count")
     total_vacancies_count = df.shape[0]
@@ -105,14 +89,19 @@ def get_singleprocess_statistics(file_name, job_name, area_name, dates_currencie
         cities_salaries[city] = int(city_df["salary"].mean())
         cities_vacancies_ratios[city] = round(city_df.shape[0] / total_vacancies_count, 4)
 
-    # Динамика уровня зарплат по годам для выбранной профессии и региона
-    # Динамика количества вакансий по годам для выбранной профессии и региона
-    job_df = df[df["name"].str.contains(job_name)]
-    for year in years:
-        year_df = job_df[(job_df["year"] == year) & (job_df["area_name"] == area_name)]
-        if year_df.shape[0] > 0:
-            years_job_salaries[year] = int(year_df["salary"].mean())
-            years_job_vacancies_count[year] = year_df.shape[0]
+    # Динамика уровня зарплат по годам для выбранных профессий и региона
+    # Динамика количества вакансий по годам для выбранных профессий и региона
+    area_df = df[df["area_name"] == area_name]
+    years_codes = pd.Categorical(area_df["year"], categories=years).codes
+    jobs_sums, jobs_counts = get_jobs_grouped_sums(area_df["name"], job_names, area_df["salary"].to_numpy(),
+                                                   years_codes, len(years))
+    for job_name, job_sums, job_counts in zip(job_names, jobs_sums.tolist(), jobs_counts.tolist()):
+        years_job_salaries[job_name] = {}
+        years_job_vacancies_count[job_name] = {}
+        for year, year_sum, year_count in zip(years, job_sums, job_counts):
+            if year_count > 0:
+                years_job_salaries[job_name][year] = int(year_sum / year_count)
+                years_job_vacancies_count[job_name][year] = year_count
 
     slice_end = 10 if len(cities_salaries.items()) > 10 else len(cities_salaries.items())
     cities_salaries = dict(
@@ -137,20 +126,20 @@ def get_singleprocess_statistics(file_name, job_name, area_name, dates_currencie
 """
 Метод для многопроцессной обработки данных по годам
 """
-def get_multiprocess_statistics(job_name, dates_currencies):
-    files_count = len([x for x in os.listdir("csv_files")])
-    with concurrent.futures.ThreadPoolExecutor(max_workers=files_count) as executor:
-        futures = [executor.submit(get_year_statistics, os.path.join("csv_files", file_name), job_name, dates_currencies) for
-                   file_name in
-                   os.listdir("csv_files")]
-    output = [future.result() for future in concurrent.futures.as_completed(futures)]
-    result = [{} for _ in range(4)]
-    for year_data in output:
-        for i in range(4):
-            result[i][year_data[0]] = year_data[i + 1]
-
-    for i in range(len(result)):
-        result[i] = dict(sorted(result[i].items(), key=lambda x: x[0]))
+def get_multiprocess_statistics(job_names, exchange_rates, file_format="csv", max_workers=None, chunk_size=1):
+    file_names = [os.path.join("csv_files", x) for x in os.listdir("csv_files") if x.endswith(f".{file_format}")]
+    max_workers = max(1, min(max_workers or os.cpu_count(), len(file_names)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                initializer=init_year_statistics_worker,
+                                                initargs=(exchange_rates,)) as executor:
+        output = list(executor.map(get_year_statistics, file_names, itertools.repeat(job_names), chunksize=chunk_size))
+    result = [{}, {}, {job_name: {} for job_name in job_names}, {job_name: {} for job_name in job_names}]
+    for year_data in sorted(output, key=lambda x: x[0]):
+        result[0][year_data[0]] = year_data[1]
+        result[1][year_data[0]] = year_data[2]
+        for job_name in job_names:
+            result[2][job_name][year_data[0]] = year_data[3][job_name]
+            result[3][job_name][year_data[0]] = year_data[4][job_name]
     return result
 
 
@@ -193,6 +182,7 @@ class Report:
         self.__render_cities_vacancies_ratios_graph(ax[1, 1])
         plt.tight_layout()
         plt.savefig("graph.png")
+        plt.close(fig)
 
     """
     Метод, отвечающий за отрисовку графика, включающего в себя данные об уровне зарплат по годам в целом и для выбранной профессии 
@@ -274,7 +264,7 @@ class Report:
     """
     Метод, отвечающий за генерацию отчета в формате .pdf
     """
-    def generate_pdf(self):
+    def generate_pdf(self, file_name="report.pdf"):
         env = Environment(loader=FileSystemLoader("."))
         template = env.get_template("pdf_template.html")
 
@@ -290,20 +280,22 @@ class Report:
              "years_job_city_vacancies_count": self.years_job_city_vacancies_count,
              "years_headers": years_headers})
         config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": None})
+        pdfkit.from_string(pdf_template, file_name, configuration=config, options={"enable-local-file-access": None})
 
 
 if __name__ == "__main__":
     file_name = input("Введите название файла: ")
-    job_name = input("Введите название профессии: ")
+    # Можно ввести несколько профессий через запятую: общие данные считаются один раз, отчеты строятся для каждой
+    job_names = FileHandler.get_job_names(input("Введите название профессии: "))
     area_name = input("Введите название региона: ")
 
-    separate_csv(file_name)
-    df_dates_currencies = pd.read_csv("cb_currencies.csv")
+    YearPartitions.separate_csv(file_name, file_format=partition_format)
+    exchange_rates = ExchangeRates.from_csv("cb_currencies.csv")
 
-    output_multiprocess_data = get_multiprocess_statistics(job_name, df_dates_currencies)
-    output_singleprocess_data = get_singleprocess_statistics(file_name, job_name, area_name, df_dates_currencies)
-    report = Report(job_name, area_name, output_multiprocess_data[0], output_multiprocess_data[1], output_singleprocess_data[0], output_multiprocess_data[2], output_multiprocess_data[3], output_singleprocess_data[1], output_singleprocess_data[2], output_singleprocess_data[3])
-    report.render_graph()
-    report.generate_pdf()
+    output_multiprocess_data = get_multiprocess_statistics(job_names, exchange_rates, partition_format)
+    output_singleprocess_data = get_singleprocess_statistics(file_name, job_names, area_name, exchange_rates)
+    for i, job_name in enumerate(job_names):
+        report = Report(job_name, area_name, output_multiprocess_data[0], output_multiprocess_data[1], output_singleprocess_data[0], output_multiprocess_data[2][job_name], output_multiprocess_data[3][job_name], output_singleprocess_data[1], output_singleprocess_data[2][job_name], output_singleprocess_data[3][job_name])
+        report.render_graph()
+        report.generate_pdf("report.pdf" if len(job_names) == 1 else f"report_{i + 1}.pdf")
 
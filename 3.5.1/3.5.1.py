@@ -1,10 +1,35 @@
+import csv
 import sqlite3
-import pandas as pd
 
-pd.set_option("expand_frame_repr", False)
 
-df = pd.read_csv("cb_currencies.csv")
+def get_month_number(date):
+    return int(date[3:7]) * 12 + int(date[0:2]) - 1
 
-# Работа с базой данных
-con = sqlite3.connect("cb_currencies.db")
-df.to_sql("cb_currencies", con, if_exists="replace", index=False)
\ No newline at end of file
+
+# Дописывание в таблицу курсов только тех месяцев из CSV-файла, которых в ней еще нет
+def update_currencies_table(con, file_name, table_name="cb_currencies"):
+    with open(file_name, encoding="utf_8_sig", newline="") as file:
+        reader = csv.reader(file)
+        columns = next(reader)
+        rows = [row for row in reader if len(row) > 0]
+
+    currencies_columns = ", ".join(f'"{column}" real' for column in columns[1:])
+    con.execute(f'create table if not exists "{table_name}" ("date" text, {currencies_columns})')
+    con.execute(f'create unique index if not exists "ix_{table_name}_date" on "{table_name}" ("date")')
+    last_month = con.execute(f'select max(substr("date", 4, 4) * 12 + substr("date", 1, 2) - 1) from "{table_name}"').fetchone()[0]
+    new_rows = [[row[0]] + [float(value) if value != "" else None for value in row[1:]]
+                for row in rows if last_month is None or get_month_number(row[0]) > last_month]
+
+    columns_names = ", ".join(f'"{column}"' for column in columns)
+    updates = ", ".join(f'"{column}" = excluded."{column}"' for column in columns[1:])
+    with con:
+        con.executemany(f'insert into "{table_name}" ({columns_names}) values ({", ".join("?" * len(columns))}) '
+                        f'on conflict ("date") do update set {updates}', new_rows)
+    return len(new_rows)
+
+
+if __name__ == "__main__":
+    # Работа с базой данных
+    con = sqlite3.connect("cb_currencies.db")
+    update_currencies_table(con, "cb_currencies.csv")
+    con.close()
@@ -1,66 +1,153 @@
 import sqlite3
+import os
+import sys
 import pandas as pd
-from statistics import mean
-import math
+import numpy as np
 
-currency_name_to_number = {
-    "BYR": 1,
-    "USD": 2,
-    "EUR": 3,
-    "KZT": 4,
-    "UAH": 5
-}
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from exchange_rates import ExchangeRates
+from published_at import PublishedAt
 
 pd.set_option("expand_frame_repr", False)
 
-#Обработка данных о зарплате
-def handle_salary(date, salary_from, salary_to, salary_currency, cur):
-    currency_exchange = 0
-    if salary_currency in ["BYN", "BYR", "EUR", "KZT", "UAH", "USD"]:
-        salary_currency.replace("BYN", "BYR")
-        date = f"{date[1]}-{date[0]}"
-        cur.execute("select * from cb_currencies where date == :date", {"date": date})
-        currency_exchange = cur.fetchall()[0][currency_name_to_number[salary_currency]]
-    elif salary_currency == "RUR":
-        currency_exchange = 1
-
-    if not (math.isnan(salary_from)) and not (math.isnan(salary_to)):
-        to_return_salary = mean([salary_from, salary_to]) * currency_exchange
-    elif not (math.isnan(salary_from)):
-        to_return_salary = salary_from * currency_exchange
-    else:
-        to_return_salary = salary_to * currency_exchange
-
-    if math.isnan(to_return_salary):
-        return to_return_salary
-    return int(to_return_salary)
-
-
-df = pd.read_csv("vacancies_dif_currencies.csv")
-con = sqlite3.connect("cb_currencies.db")
-cur = con.cursor()
-
-# Запись в отдельный столбец корректной информации о зарплате
-df["salary"] = df.apply(lambda row:
-                        handle_salary(row["published_at"][:7].split("-"),
-                                      row["salary_from"],
-                                      row["salary_to"],
-                                      row["salary_currency"],
-                                      cur),
-                        axis=1)
-
-# Отсеиваем строки с пустой зарплатой
-df = df[df["salary"].notnull()]
-
-# Приведение формата даты к указанному в задании
-df["published_at"] = df.apply(lambda row: row["published_at"][0:7], axis=1)
-
-# Удаление ненужных столбцов
-df = df.drop(["salary_from", "salary_to", "salary_currency"], axis=1)
-
-# Приведение порядка столбцов к указанному в задании
-df = df.loc[:, ["name", "salary", "area_name", "published_at"]]
-
-# Работа с базой данных
-con = sqlite3.connect("../3.5.3/vacancies.db")
-df.to_sql("vacancies", con=con, if_exists="replace", index=False)
\ No newline at end of file
+# Типизированная схема: год и месяц хранятся числами, регионы вынесены в справочник.
+# Триграммный индекс vacancies_names позволяет искать name like '%...%' без просмотра всех вакансий.
+# Представление vacancies сохраняет прежний вид таблицы (name, salary, area_name, published_at)
+vacancies_schema = [
+    "create table if not exists areas (id integer primary key, name text not null unique)",
+    "create table if not exists vacancies_data ("
+    "id integer primary key, name text not null, salary integer not null, "
+    "area_id integer not null references areas (id), year integer not null, month integer not null)",
+    "create virtual table if not exists vacancies_names using fts5("
+    "name, content='vacancies_data', content_rowid='id', tokenize='trigram')",
+    "create view if not exists vacancies as "
+    "select vacancies_data.name, salary, areas.name as area_name, printf('%04d-%02d', year, month) as published_at, "
+    "year, month from vacancies_data join areas on areas.id = vacancies_data.area_id",
+    # Суммы и количества зарплат по годам и регионам, а также по годам для отслеживаемых профессий
+    "create table if not exists year_area_salaries (year integer not null, area_id integer not null, "
+    "salary_sum integer not null, vacancies_count integer not null, primary key (year, area_id)) without rowid",
+    "create table if not exists job_names (name text primary key)",
+    "create table if not exists year_job_salaries (year integer not null, job_name text not null, "
+    "salary_sum integer not null, vacancies_count integer not null, primary key (year, job_name)) without rowid",
+]
+
+# Индексы создаются после вставки строк: построить индекс один раз быстрее, чем обновлять его при каждой вставке
+vacancies_indexes = [
+    "create index if not exists ix_vacancies_data_year on vacancies_data (year)",
+    "create index if not exists ix_vacancies_data_area_id on vacancies_data (area_id)",
+]
+
+
+#Подключение к базе данных с настройками для массовой записи
+def connect(file_name):
+    con = sqlite3.connect(file_name)
+    con.execute("pragma journal_mode = wal")
+    con.execute("pragma synchronous = normal")
+    con.execute("pragma temp_store = memory")
+    con.execute("pragma cache_size = -262144")
+    return con
+
+
+#Создание схемы; при replace=True ранее загруженные вакансии удаляются
+def create_schema(con, replace=True):
+    if replace:
+        # В базах, записанных прежним загрузчиком через to_sql, vacancies - таблица, а не представление
+        for name in ["vacancies", "vacancies_names", "vacancies_data", "areas", "year_area_salaries", "job_names",
+                     "year_job_salaries"]:
+            row = con.execute("select type from sqlite_master where name = ?", (name,)).fetchone()
+            if row is not None:
+                con.execute(f"drop {row[0]} {name}")
+    for statement in vacancies_schema:
+        con.execute(statement)
+
+
+#Условие отбора вакансий профессии; триграммный индекс находит только подстроки не короче трех символов,
+#более короткие названия ищутся простым like по всем вакансиям
+def get_job_condition(job_name):
+    if len(job_name) < 3:
+        return "name like ?"
+    return "id in (select rowid from vacancies_names where name like ?)"
+
+
+#Добавление к сводным таблицам вакансий с номерами от first_id; профессии из job_names_to_refresh пересчитываются по всем строкам
+def refresh_aggregates(con, first_id, job_names_to_refresh=()):
+    con.execute("insert into year_area_salaries select year, area_id, sum(salary), count(*) from vacancies_data "
+                "where id >= ? group by year, area_id on conflict (year, area_id) do update set "
+                "salary_sum = salary_sum + excluded.salary_sum, vacancies_count = vacancies_count + excluded.vacancies_count",
+                (first_id,))
+    for (job_name,) in con.execute("select name from job_names").fetchall():
+        job_first_id = 1 if job_name in job_names_to_refresh else first_id
+        con.execute("insert into year_job_salaries select year, ?, sum(salary), count(*) from vacancies_data "
+                    f"where id >= ? and {get_job_condition(job_name)} group by year "
+                    "on conflict (year, job_name) do update set "
+                    "salary_sum = salary_sum + excluded.salary_sum, vacancies_count = vacancies_count + excluded.vacancies_count",
+                    (job_name, job_first_id, f"%{job_name}%"))
+
+
+#Регистрация профессий, статистика по которым поддерживается в таблице year_job_salaries; возвращает новые профессии
+def insert_job_names(con, job_names):
+    known_job_names = {job_name for (job_name,) in con.execute("select name from job_names")}
+    new_job_names = list(dict.fromkeys(job_name for job_name in job_names if job_name not in known_job_names))
+    con.executemany("insert into job_names (name) values (?)", [(job_name,) for job_name in new_job_names])
+    return new_job_names
+
+
+#Добавление профессий в уже загруженную базу с подсчетом статистики по ним
+def add_job_names(con, job_names):
+    with con:
+        new_job_names = insert_job_names(con, job_names)
+        first_id = con.execute("select coalesce(max(id), 0) + 1 from vacancies_data").fetchone()[0]
+        refresh_aggregates(con, first_id, new_job_names)
+    return len(new_job_names)
+
+
+#Потоковая загрузка вакансий из CSV-файла частями по chunk_size строк в одной транзакции
+def load_vacancies(con, file_name, exchange_rates, chunk_size=100000, replace=True, job_names=()):
+    loaded_count = 0
+    with con:
+        create_schema(con, replace)
+        new_job_names = insert_job_names(con, job_names)
+        areas_ids = dict(con.execute("select name, id from areas"))
+        first_id = con.execute("select coalesce(max(id), 0) + 1 from vacancies_data").fetchone()[0]
+        columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+        for df in pd.read_csv(file_name, usecols=columns, chunksize=chunk_size):
+            # Запись в отдельный столбец корректной информации о зарплате, отсеиваем строки с пустой зарплатой
+            salaries = exchange_rates.convert_salaries(df["salary_from"], df["salary_to"], df["published_at"],
+                                                       df["salary_currency"])
+            df["salary"] = np.trunc(salaries)
+            df = df[df["salary"].notnull()]
+            # Пустые название и регион хранятся пустыми строками, чтобы вакансия не выпала из статистики
+            df = df.fillna({"name": "", "area_name": ""})
+
+            # Новые регионы дописываются в справочник, в вакансиях хранится только их номер
+            new_areas = [area for area in df["area_name"].unique() if area not in areas_ids]
+            for area in new_areas:
+                areas_ids[area] = len(areas_ids) + 1
+            con.executemany("insert into areas (id, name) values (?, ?)", [(areas_ids[area], area) for area in new_areas])
+
+            # Год и месяц разбираются сразу для всего столбца дат по кодам символов
+            months = PublishedAt.get_months(df["published_at"].to_numpy())
+            rows = zip(df["name"].tolist(),
+                       df["salary"].astype(np.int64).tolist(),
+                       df["area_name"].map(areas_ids).tolist(),
+                       (months // 12).tolist(),
+                       (months % 12 + 1).tolist())
+            con.executemany("insert into vacancies_data (name, salary, area_id, year, month) values (?, ?, ?, ?, ?)",
+                            rows)
+            loaded_count += df.shape[0]
+        # Триграммный индекс по названиям вакансий заполняется один раз после вставки всех строк
+        con.execute("insert into vacancies_names (rowid, name) select id, name from vacancies_data where id >= ?",
+                    (first_id,))
+        for statement in vacancies_indexes:
+            con.execute(statement)
+        refresh_aggregates(con, first_id, new_job_names)
+    return loaded_count
+
+
+if __name__ == "__main__":
+    exchange_rates = ExchangeRates.from_sqlite("cb_currencies.db")
+
+    # Работа с базой данных
+    con = connect("../3.5.3/vacancies.db")
+    load_vacancies(con, "vacancies_dif_currencies.csv", exchange_rates, job_names=["Программист"])
+    con.close()
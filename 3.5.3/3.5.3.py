@@ -5,61 +5,52 @@ pd.set_option("expand_frame_repr", False)
 
 if __name__ == "__main__":
     con = sqlite3.connect("vacancies.db")
-    vacancies_count = pd.read_sql("select count(*) from vacancies", con).to_dict()["count(*)"][0]
+    # Статистика читается из сводных таблиц, которые 3.5.2 заполняет при загрузке вакансий
+    vacancies_count = int(pd.read_sql("select sum(vacancies_count) from year_area_salaries", con).iloc[0, 0])
 
-    # Динамика уровня зарплат по годам
-    years_salaries_raw = pd.\
-        read_sql("select substr(published_at, 0, 5), round(avg(salary)) from vacancies group by substr(published_at, 0, 5)", con).\
-        to_dict()
-    years_salaries = dict(
-        zip(
-            years_salaries_raw["substr(published_at, 0, 5)"].values(), years_salaries_raw["round(avg(salary))"].values()))
+    # Динамика уровня зарплат и количества вакансий по годам
+    years_raw = pd.read_sql(
+        "select printf('%04d', year) as year, round(1.0 * sum(salary_sum) / sum(vacancies_count)) as salary, "
+        "sum(vacancies_count) as count from year_area_salaries group by year order by year", con)
+    years_salaries = dict(zip(years_raw["year"], years_raw["salary"]))
+    years_vacancies = dict(zip(years_raw["year"], years_raw["count"]))
 
-    # Динамика количества вакансий по годам
-    years_vacancies_raw = pd.\
-        read_sql("select substr(published_at, 0, 5), count(*) from vacancies group by substr(published_at, 0, 5)", con).\
-        to_dict()
-    years_vacancies = dict(
-        zip(
-            years_vacancies_raw["substr(published_at, 0, 5)"].values(), years_vacancies_raw["count(*)"].values()))
-
-    # Динамика уровня зарплат по годам для выбранной профессии
-    job_name = "Программист"
-    db_job_name = f"%{job_name}%"
-    job_years_salaries_raw = pd.\
-        read_sql("select substr(published_at, 0, 5), round(avg(salary)) from vacancies where name like :db_job_name group by substr(published_at, 0, 5)", con, params=[db_job_name])\
-        .to_dict()
-    job_years_salaries = dict(
-        zip(
-            job_years_salaries_raw["substr(published_at, 0, 5)"].values(), job_years_salaries_raw["round(avg(salary))"].values()))
-
-    # Динамика количества вакансий по годам для выбранной профессии
+    # Динамика уровня зарплат и количества вакансий по годам для выбранной профессии
     job_name = "Программист"
-    db_job_name = f"%{job_name}%"
-    job_years_vacancies = pd\
-        .read_sql("select substr(published_at, 0, 5), count(substr(published_at, 0, 5)) from vacancies where name like :db_job_name group by substr(published_at, 0, 5)", con, params=[db_job_name])\
-        .to_dict()
-    job_years_vacancies = dict(
-        zip(
-            job_years_vacancies["substr(published_at, 0, 5)"].values(), job_years_vacancies["count(substr(published_at, 0, 5))"].values()))
+    if pd.read_sql("select count(*) from job_names where name = :job_name", con, params=[job_name]).iloc[0, 0] > 0:
+        job_years_raw = pd.read_sql(
+            "select printf('%04d', year) as year, round(1.0 * salary_sum / vacancies_count) as salary, "
+            "vacancies_count as count from year_job_salaries where job_name = :job_name order by year", con,
+            params=[job_name])
+    else:
+        # Триграммный индекс находит только подстроки не короче трех символов
+        if len(job_name) < 3:
+            job_condition = "name like :db_job_name"
+        else:
+            job_condition = "id in (select rowid from vacancies_names where name like :db_job_name)"
+        job_years_raw = pd.read_sql(
+            "select printf('%04d', year) as year, round(avg(salary)) as salary, count(*) as count "
+            f"from vacancies_data where {job_condition} group by year order by year", con,
+            params=[f"%{job_name}%"])
+    job_years_salaries = dict(zip(job_years_raw["year"], job_years_raw["salary"]))
+    job_years_vacancies = dict(zip(job_years_raw["year"], job_years_raw["count"]))
 
-    # Уровень зарплат по городам (в порядке убывания) - только первые 10 значений
-    cities_salaries_raw = pd.read_sql("select area_name, round(avg(salary)), count(area_name) from vacancies group by area_name", con)
-    cities_salaries_raw = cities_salaries_raw[cities_salaries_raw["count(area_name)"] >= 0.01 * vacancies_count].to_dict()
+    # Уровень зарплат и доля вакансий по городам (в порядке убывания) - только первые 10 значений
+    cities_raw = pd.read_sql(
+        "select areas.name as area_name, round(1.0 * sum(salary_sum) / sum(vacancies_count)) as salary, "
+        "sum(vacancies_count) as count from year_area_salaries join areas on areas.id = year_area_salaries.area_id "
+        "group by areas.name order by areas.name", con)
+    cities_raw = cities_raw[cities_raw["count"] >= 0.01 * vacancies_count]
 
     cities_salaries = dict(
         sorted(
-            zip(cities_salaries_raw["area_name"].values(), cities_salaries_raw["round(avg(salary))"].values()),
+            zip(cities_raw["area_name"], cities_raw["salary"]),
             key=lambda x: x[1],
             reverse=True)[:10])
 
-    # Доля вакансий по городам (в порядке убывания) - только первые 10 значений
-    cities_vacancies_ratios_raw = pd.read_sql("select area_name, count(area_name) from vacancies group by area_name", con)
-    cities_vacancies_ratios_raw = cities_vacancies_ratios_raw[cities_vacancies_ratios_raw["count(area_name)"] >= 0.01 * vacancies_count].to_dict()
-
     cities_vacancies_ratios = dict(
         sorted(
-            zip(cities_vacancies_ratios_raw["area_name"].values(), cities_vacancies_ratios_raw["count(area_name)"].values()),
+            zip(cities_raw["area_name"], cities_raw["count"]),
             key=lambda x: x[1],
             reverse=True)[:10])
     for city in cities_vacancies_ratios.keys():
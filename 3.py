@@ -1,11 +1,11 @@
 import csv
-from datetime import datetime
 import math
 import re
 import matplotlib.pyplot as plt
 from matplotlib.ticker import IndexLocator
 from jinja2 import Environment, FileSystemLoader
 import pdfkit
+from published_at import PublishedAt
 
 
 class FileHandler:
@@ -19,25 +19,35 @@ class FileHandler:
 
     @staticmethod
     def csv_reader(file_name):
-        reader = csv.reader(open(file_name, encoding="utf_8_sig"))
-        data = [Vacancy(row) for row in list(filter(lambda x: "" not in x, reader))[1:]]
-        return data
+        return list(FileHandler.csv_stream(file_name))
+
+    @staticmethod
+    def csv_stream(file_name):
+        with open(file_name, encoding="utf_8_sig") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                if "" not in row:
+                    yield Vacancy(row)
 
 
 class Vacancy:
+    __slots__ = ("name", "salary", "city", "year")
+
+    __currencies_exchanges = {
+        "AZN": 35.68,
+        "BYR": 23.91,
+        "EUR": 59.90,
+        "GEL": 21.74,
+        "KGS": 0.76,
+        "KZT": 0.13,
+        "RUR": 1,
+        "UAH": 1.64,
+        "USD": 60.66,
+        "UZS": 0.0055
+    }
+
     def __init__(self, vacancy_info):
-        self.__currencies_exchanges = {
-            "AZN": 35.68,
-            "BYR": 23.91,
-            "EUR": 59.90,
-            "GEL": 21.74,
-            "KGS": 0.76,
-            "KZT": 0.13,
-            "RUR": 1,
-            "UAH": 1.64,
-            "USD": 60.66,
-            "UZS": 0.0055
-        }
         if len(vacancy_info) > 6:
             vacancy_info = [vacancy_info[0], vacancy_info[6], vacancy_info[7], vacancy_info[9], vacancy_info[10],
                             vacancy_info[11]]
@@ -45,7 +55,7 @@ class Vacancy:
         self.salary = int(0.5 * self.__currencies_exchanges[vacancy_info[3]] * (
                 float(vacancy_info[1]) + float(vacancy_info[2])))
         self.city = vacancy_info[4]
-        self.year = int(datetime.strptime(vacancy_info[5], '%Y-%m-%dT%H:%M:%S%z').strftime('%Y'))
+        self.year = PublishedAt.get_year(vacancy_info[5])
 
 
 class Statistics:
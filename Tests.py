@@ -1,8 +1,31 @@
+import contextlib
+import csv
+import importlib.util
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 from unittest import TestCase
+import numpy as np
+import pandas as pd
 from main import Vacancy
 from main import DataSet
 from main import InputConnect
 from main import Statistics
+from main import StatisticsAccumulator
+from main import FileHandler
+from main import VacancyTable
+from main import VacancyRecord
+from exchange_rates import ExchangeRates
+from name_index import NameIndex
+from keyword_matcher import KeywordMatcher
+from year_partitions import YearPartitions
+from published_at import PublishedAt
+from datetime import datetime
 
 
 test_vacancy_info = ['Оператор ЧПУ',
@@ -33,11 +56,72 @@ test_vacancy_info_eur = ['Senior Python Developer (Crypto)',
                          '2022-07-05T18:23:15+0300']
 
 
+test_columns = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+                'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+
 test_vacancies_info = [
     Vacancy(test_vacancy_info),
     Vacancy(test_vacancy_info_eur)
 ]
 
+def load_script(file_name):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(file_name))[0], file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class RecordedResponsesHandler(BaseHTTPRequestHandler):
+    responses = {}
+    requested_paths = []
+    failures_count = 0
+
+    def do_GET(self):
+        RecordedResponsesHandler.requested_paths.append(self.path)
+        if RecordedResponsesHandler.failures_count > 0:
+            RecordedResponsesHandler.failures_count -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        content = RecordedResponsesHandler.responses[self.path.split("date_req=")[1][:10]].encode("windows-1251")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class VacanciesApiHandler(BaseHTTPRequestHandler):
+    vacancies = []
+    requested_params = []
+    failing_pages = {}
+    pages_limit = 20
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        VacanciesApiHandler.requested_params.append(params)
+        page, per_page = int(params["page"]), int(params["per_page"])
+        if VacanciesApiHandler.failing_pages.get(page, 0) > 0:
+            VacanciesApiHandler.failing_pages[page] -= 1
+            self.send_response(500)
+            self.end_headers()
+            return
+        found = [vacancy for vacancy in VacanciesApiHandler.vacancies
+                 if params["date_from"] <= vacancy["published_at"][:19] <= params["date_to"]]
+        pages = min((len(found) + per_page - 1) // per_page, VacanciesApiHandler.pages_limit)
+        items = found[page * per_page:(page + 1) * per_page] if page < pages else []
+        content = json.dumps({"found": len(found), "pages": pages, "items": items}).encode("utf_8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
 class VacancyTests(TestCase):
     def test_vacancy_type(self):
         self.assertEqual(type(Vacancy(test_vacancy_info)).__name__, "Vacancy")
@@ -54,6 +138,427 @@ class VacancyTests(TestCase):
     def test_vacancy_average_salary_eur(self):
         self.assertEqual(Vacancy(test_vacancy_info_eur).salary, 299500)
 
+class VacancyTableTests(TestCase):
+    def test_columns(self):
+        table = VacancyTable()
+        table.append(test_vacancy_info)
+        table.append(test_vacancy_info_eur)
+        table.append(test_vacancy_info)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.names, ["Оператор ЧПУ", "Senior Python Developer (Crypto)"])
+        self.assertEqual(table.cities, ["Артем", "Москва"])
+        self.assertEqual(table.name_codes.tolist(), [0, 1, 0])
+        self.assertEqual(table.salaries.tolist(), [75000, 299500, 75000])
+        self.assertEqual(table.years.tolist(), [2022, 2022, 2022])
+
+    def test_name_mask(self):
+        table = VacancyTable.from_vacancies(test_vacancies_info)
+        self.assertEqual(table.get_name_mask("Python").tolist(), [False, True])
+
+    def test_prepare_statistic_from_table(self):
+        table_statistics = Statistics()
+        table_statistics.prepare(VacancyTable.from_vacancies(test_vacancies_info), "Python")
+        list_statistics = Statistics()
+        list_statistics.prepare(test_vacancies_info, "Python")
+        self.assertEqual(table_statistics.get_prepared_statistics(), list_statistics.get_prepared_statistics())
+        self.assertEqual(table_statistics.job_years_salaries, {2022: 299500})
+
+
+    def test_cached_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            cache_directory = os.path.join(directory, "cache")
+            with open(file_name, "w", encoding="utf_8_sig", newline="") as file:
+                csv.writer(file).writerows([test_columns, test_vacancy_info, test_vacancy_info_eur])
+            table = FileHandler.csv_cached_table(file_name, cache_directory)
+            cached_table = FileHandler.csv_cached_table(file_name, cache_directory)
+            self.assertEqual(cached_table.names, table.names)
+            self.assertEqual(cached_table.salaries.tolist(), [75000, 299500])
+            with open(file_name, "a", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerow(test_vacancy_info)
+            self.assertEqual(len(FileHandler.csv_cached_table(file_name, cache_directory)), 3)
+            self.assertEqual(cached_table.get_name_mask("Python").tolist(), [False, True])
+
+    def test_names_index(self):
+        names = ["Программист Python", "Senior Python Developer", "Py", "программист 1С"]
+        index = NameIndex(names)
+        self.assertEqual(index.find("Программист"), [0])
+        self.assertEqual(index.find("Python"), [0, 1])
+        self.assertEqual(index.find("Py"), [0, 1, 2])
+        self.assertEqual(index.find("Java"), [])
+        names.append("Python-разработчик")
+        self.assertEqual(index.get_mask("Python").tolist(), [True, True, False, False, True])
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(os.path.join(directory, "names_index.npz"))
+            loaded_index = NameIndex.load(os.path.join(directory, "names_index.npz"), names)
+        self.assertEqual(loaded_index.find("программист"), [3])
+        self.assertEqual(loaded_index.find("Python"), [0, 1, 4])
+
+
+class ExchangeRatesTests(TestCase):
+    def test_convert(self):
+        rates = ExchangeRates.from_rows(["date", "BYR", "USD"], [["01-2022", "20", "60"], ["03-2022", "", "70"]])
+        months = ExchangeRates.get_months(["2022-01-05T10:00:00+0300", "2022-03-01T10:00:00+0300",
+                                           "2022-02-01T10:00:00+0300", "2022-03-01T10:00:00+0300",
+                                           "2021-12-01T10:00:00+0300", "2022-01-05T10:00:00+0300"])
+        result = rates.convert([10, 10, 10, 10, 10, 10], months, ["BYN", "USD", "USD", "BYR", "RUR", "GEL"],
+                               unknown_currency_rate=0)
+        self.assertEqual(result[:2].tolist(), [200, 700])
+        self.assertTrue(all(value != value for value in result[2:4]))
+        self.assertEqual(result[4:].tolist(), [10, 0])
+        self.assertEqual(rates.get_rate("USD", ExchangeRates.get_month("2022-03")), 70)
+
+    def test_convert_salaries(self):
+        rates = ExchangeRates.from_rows(["date", "USD"], [["01-2022", "60"], ["02-2022", "70"]])
+        nan = float("nan")
+        result = rates.convert_salaries([1000, nan, 1000, nan, 1000], [3000, 2000, nan, nan, 3000],
+                                        ["2022-01-05T10:00:00+0300", "2022-02-01T10:00:00+0300",
+                                         "2022-02-01T10:00:00+0300", "2022-02-01T10:00:00+0300",
+                                         "2022-01-05T10:00:00+0300"], ["USD", "USD", "RUR", "USD", "GEL"])
+        self.assertEqual(result[:3].tolist(), [120000, 140000, 1000])
+        self.assertTrue(result[3] != result[3])
+        self.assertEqual(result[4], 0)
+
+    def test_load_from_csv_and_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file_name = os.path.join(directory, "cb_currencies.csv")
+            with open(csv_file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([["date", "USD", "EUR"], ["02-2022", "60", "70"]])
+            db_file_name = os.path.join(directory, "cb_currencies.db")
+            connection = sqlite3.connect(db_file_name)
+            connection.execute("create table cb_currencies (date text, USD real, EUR real)")
+            connection.execute("insert into cb_currencies values ('02-2022', 60, 70)")
+            connection.commit()
+            connection.close()
+            month = ExchangeRates.get_month("2022-02")
+            for rates in [ExchangeRates.from_csv(csv_file_name), ExchangeRates.from_sqlite(db_file_name)]:
+                self.assertEqual(rates.convert([1, 1], [month, month], ["EUR", "USD"]).tolist(), [70, 60])
+            rates.save(os.path.join(directory, "rates"))
+            loaded_rates = ExchangeRates.load(os.path.join(directory, "rates"))
+            self.assertEqual(loaded_rates.get_rate("EUR", month), 70)
+            self.assertIsInstance(loaded_rates.rates, np.memmap)
+
+    def test_constant_rates_match_vacancy_salary(self):
+        rates = ExchangeRates.from_constants({"EUR": 59.90})
+        self.assertEqual(int(0.5 * rates.get_rate("EUR") * (4500 + 5500)), Vacancy(test_vacancy_info_eur).salary)
+
+
+class CbCurrenciesTests(TestCase):
+    def test_download_with_cache_and_retries(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.3.1", "3.3.1.py"))
+        RecordedResponsesHandler.responses = {
+            "15/01/2016": '<?xml version="1.0" encoding="windows-1251"?><ValCurs Date="15.01.2016" name="Foreign Currency Market">'
+                          '<Valute ID="R01090"><NumCode>974</NumCode><CharCode>BYR</CharCode><Nominal>10000</Nominal>'
+                          '<Name>Белорусских рублей</Name><Value>38,6080</Value></Valute><Valute ID="R01235"><NumCode>840</NumCode>'
+                          '<CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США</Name><Value>76,5676</Value></Valute></ValCurs>',
+            "15/07/2016": '<?xml version="1.0" encoding="windows-1251"?><ValCurs Date="15.07.2016" name="Foreign Currency Market">'
+                          '<Valute ID="R01090B"><NumCode>933</NumCode><CharCode>BYN</CharCode><Nominal>1</Nominal>'
+                          '<Name>Белорусский рубль</Name><Value>32,1466</Value></Valute></ValCurs>'
+        }
+        RecordedResponsesHandler.requested_paths = []
+        RecordedResponsesHandler.failures_count = 1
+        server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedResponsesHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/scripts/XML_daily.asp"
+            with tempfile.TemporaryDirectory() as directory:
+                for i in range(2):
+                    result = script.get_currencies_exchanges(["01/2016", "07/2016"], ["BYR", "USD"], url, directory, 2)
+                    self.assertEqual(result["date"].tolist(), ["01-2016", "07-2016"])
+                    self.assertEqual(result["BYR"].tolist(), [38.6080 / 10000, 32.1466])
+                    self.assertEqual(result["USD"].tolist()[0], 76.5676)
+                    self.assertEqual(len(RecordedResponsesHandler.requested_paths), 3)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_incremental_updates(self):
+        directory_name = os.path.dirname(os.path.abspath(__file__))
+        cb_script = load_script(os.path.join(directory_name, "3.3.1", "3.3.1.py"))
+        db_script = load_script(os.path.join(directory_name, "3.5.1", "3.5.1.py"))
+        RecordedResponsesHandler.requested_paths = []
+        RecordedResponsesHandler.failures_count = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedResponsesHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/scripts/XML_daily.asp"
+            with tempfile.TemporaryDirectory() as directory:
+                file_name = os.path.join(directory, "cb_currencies.csv")
+                with open(file_name, "w", encoding="utf_8", newline="") as file:
+                    csv.writer(file).writerows([["date", "BYR", "USD"], ["05-2016", "0.003", "65.0"], ["06-2016", "", "64.0"]])
+                con = sqlite3.connect(":memory:")
+                self.assertEqual(db_script.update_currencies_table(con, file_name), 2)
+
+                until_month = cb_script.get_month_number("07-2016")
+                responses_directory = os.path.join(directory, "responses")
+                self.assertEqual(cb_script.update_currencies_exchanges(file_name, until_month, url, responses_directory), 1)
+                self.assertEqual(cb_script.update_currencies_exchanges(file_name, until_month, url, responses_directory), 0)
+                self.assertEqual(len(RecordedResponsesHandler.requested_paths), 1)
+
+                self.assertEqual(db_script.update_currencies_table(con, file_name), 1)
+                self.assertEqual(db_script.update_currencies_table(con, file_name), 0)
+                self.assertEqual(con.execute('select "date", "BYR" from cb_currencies').fetchall(),
+                                 [("05-2016", 0.003), ("06-2016", None), ("07-2016", 32.1466)])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class HhApiTests(TestCase):
+    def setUp(self):
+        self.script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.3.3", "3.3.3.py"))
+        VacanciesApiHandler.vacancies = [{
+            "name": f"Вакансия {i}",
+            "salary": {"from": 1000 * i, "to": None, "currency": "RUR"} if i % 2 else None,
+            "area": {"name": "Москва"},
+            "published_at": f"2022-12-12T{i * 86000 // 1000 // 3600:02d}:{i * 86000 // 1000 // 60 % 60:02d}:{i * 86000 // 1000 % 60:02d}+0300"
+        } for i in range(1000)]
+        VacanciesApiHandler.requested_params = []
+        VacanciesApiHandler.failing_pages = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), VacanciesApiHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/vacancies"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_crawl_resumes_after_failure(self):
+        request_dates = self.script.get_request_dates("2022-12-12T12:12:12+0300")
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            VacanciesApiHandler.failing_pages = {1: 100}
+            with self.assertRaises(RuntimeError):
+                self.script.crawl_vacancies(request_dates, file_name, url=self.url, requests_per_second=1000,
+                                            retries_count=1, backoff_factor=0)
+            VacanciesApiHandler.failing_pages = {}
+            VacanciesApiHandler.requested_params = []
+            self.script.crawl_vacancies(request_dates, file_name, url=self.url, requests_per_second=1000)
+            self.assertEqual(sorted(params["page"] for params in VacanciesApiHandler.requested_params), ["1"])
+            with open(file_name, encoding="utf_8") as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(rows[0], ["", *self.script.vacancies_columns])
+            self.assertEqual([row[0] for row in rows[1:]], [str(i) for i in range(1000)])
+            self.assertEqual(sorted(row[1] for row in rows[1:]), sorted(f"Вакансия {i}" for i in range(1000)))
+            self.assertEqual({row[1]: row[2:4] for row in rows[1:]}["Вакансия 1"], ["1000", ""])
+
+    def test_crawl_resumes_without_duplicates(self):
+        request_dates = self.script.get_request_dates("2022-12-12T12:12:12+0300")
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            VacanciesApiHandler.failing_pages = {5: 100}
+            with self.assertRaises(RuntimeError):
+                self.script.crawl_vacancies(["2022-12-12T00:00:00", "2022-12-12T23:59:59"], file_name, url=self.url,
+                                            requests_per_second=1000, retries_count=0, backoff_factor=0)
+            # Сбой между записью строк страницы и отметкой о ней в контрольной точке
+            with open(file_name, "a", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([["0", "Вакансия 0", "", "", "", "Москва", "2022-12-12T00:00:00+0300"]] * 3)
+            with open(f"{file_name}.checkpoint", "a", encoding="utf_8") as file:
+                file.write('{"window": ["2022-12-12T00:00:00", "2022-12-12T23:59:59"], "pa')
+            VacanciesApiHandler.failing_pages = {}
+            VacanciesApiHandler.requested_params = []
+            self.script.crawl_vacancies(["2022-12-12T00:00:00", "2022-12-12T23:59:59"], file_name, url=self.url,
+                                        requests_per_second=1000)
+            self.assertEqual([params["page"] for params in VacanciesApiHandler.requested_params], ["5"])
+            with open(file_name, encoding="utf_8") as file:
+                rows = list(csv.reader(file))[1:]
+            self.assertEqual([row[0] for row in rows], [str(i) for i in range(1000)])
+            self.assertEqual(sorted(row[1] for row in rows), sorted(f"Вакансия {i}" for i in range(1000)))
+            self.script.crawl_vacancies(["2022-12-12T00:00:00", "2022-12-12T23:59:59"], file_name, url=self.url,
+                                        requests_per_second=1000)
+            self.assertEqual(len(VacanciesApiHandler.requested_params), 1)
+
+    def test_crawl_replans_after_failure_during_planning(self):
+        VacanciesApiHandler.vacancies += [{
+            "name": f"Срочная вакансия {i}",
+            "salary": None,
+            "area": {"name": "Казань"},
+            "published_at": f"2022-12-12T10:{i // 60 % 60:02d}:{i % 60:02d}+0300"
+        } for i in range(3600)]
+        request_dates = ["2022-12-12T00:00:00", "2022-12-12T23:59:59"]
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            self.script.crawl_vacancies(request_dates, file_name, url=self.url, requests_per_second=1000)
+            with open(f"{file_name}.checkpoint", encoding="utf_8") as file:
+                first_window_entry = file.readline()
+            # Сбой после записи первого окна плана: строк вакансий и отметки о завершении плана еще нет
+            with open(f"{file_name}.checkpoint", "w", encoding="utf_8") as file:
+                file.write(first_window_entry)
+            with open(file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerow(["", *self.script.vacancies_columns])
+            self.assertEqual(self.script.read_checkpoint(f"{file_name}.checkpoint")["windows"], {})
+            self.script.crawl_vacancies(request_dates, file_name, url=self.url, requests_per_second=1000)
+            with open(file_name, encoding="utf_8") as file:
+                names = [row[1] for row in list(csv.reader(file))[1:]]
+        self.assertEqual(len(names), 4600)
+        self.assertEqual(len(set(names)), 4600)
+
+    def test_adaptive_windows(self):
+        VacanciesApiHandler.vacancies += [{
+            "name": f"Срочная вакансия {i}",
+            "salary": None,
+            "area": {"name": "Казань"},
+            "published_at": f"2022-12-12T10:{i // 60 % 60:02d}:{i % 60:02d}+0300"
+        } for i in range(3600)]
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            self.script.crawl_vacancies(["2022-12-12T00:00:00", "2022-12-12T06:00:00", "2022-12-12T23:59:59"],
+                                        file_name, url=self.url, requests_per_second=1000)
+            with open(file_name, encoding="utf_8") as file:
+                names = [row[1] for row in list(csv.reader(file))[1:]]
+            windows = self.script.read_checkpoint(f"{file_name}.checkpoint")["windows"]
+        self.assertEqual(len(names), 4600)
+        self.assertEqual(len(set(names)), 4600)
+        self.assertGreater(len(windows), 1)
+        self.assertLessEqual(len(VacanciesApiHandler.requested_params), 4600 // 100 + 2 * len(windows))
+
+
+class VacanciesDatabaseTests(TestCase):
+    def test_load_vacancies(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.5.2", "3.5.2.py"))
+        exchange_rates = ExchangeRates.from_rows(["date", "USD"], [["01-2022", "70"], ["02-2022", "80"]])
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([
+                    ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                    ["Программист Python", "100000", "", "RUR", "Москва", "2022-01-10T10:00:00+0300"],
+                    ["Инженер-программист", "1000", "2000", "USD", "Казань", "2022-02-10T10:00:00+0300"],
+                    ["Менеджер", "", "", "", "Москва", "2022-02-11T10:00:00+0300"],
+                    ["Ведущий Программист", "50000", "60000", "RUR", "Москва", "2021-12-01T10:00:00+0300"]
+                ])
+            con = script.connect(os.path.join(directory, "vacancies.db"))
+            self.assertEqual(script.load_vacancies(con, file_name, exchange_rates, chunk_size=2), 3)
+            self.assertEqual(script.load_vacancies(con, file_name, exchange_rates, chunk_size=2, replace=False), 3)
+            self.assertEqual(script.load_vacancies(con, file_name, exchange_rates, chunk_size=3), 3)
+            self.assertEqual(con.execute("select name, salary, area_name, published_at from vacancies").fetchall(), [
+                ("Программист Python", 100000, "Москва", "2022-01"),
+                ("Инженер-программист", 120000, "Казань", "2022-02"),
+                ("Ведущий Программист", 55000, "Москва", "2021-12")
+            ])
+            self.assertEqual(con.execute("select count(*) from areas").fetchone()[0], 2)
+            self.assertEqual(con.execute("select rowid from vacancies_names where name like '%Программист%'").fetchall(),
+                             [(1,), (3,)])
+            con.close()
+
+    def test_load_vacancies_replaces_legacy_database(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.5.2", "3.5.2.py"))
+        exchange_rates = ExchangeRates.from_constants({"USD": 60})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([
+                    ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                    ["Программист", "100", "", "RUR", "Москва", "2022-01-10T10:00:00+0300"]
+                ])
+            con = sqlite3.connect(os.path.join(directory, "vacancies.db"))
+            pd.DataFrame({"name": ["Менеджер"], "salary": [200.0], "area_name": ["Казань"],
+                          "published_at": ["2021-03"]}).to_sql("vacancies", con, index=False)
+            self.assertEqual(script.load_vacancies(con, file_name, exchange_rates), 1)
+            self.assertEqual(con.execute("select type from sqlite_master where name = 'vacancies'").fetchone()[0],
+                             "view")
+            self.assertEqual(con.execute("select name, salary, area_name, published_at from vacancies").fetchall(),
+                             [("Программист", 100, "Москва", "2022-01")])
+            con.close()
+
+    def test_load_vacancies_with_missing_name_and_area(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.5.2", "3.5.2.py"))
+        exchange_rates = ExchangeRates.from_constants({"USD": 60})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([
+                    ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                    ["Программист", "100", "", "RUR", "", "2022-01-10T10:00:00+0300"],
+                    ["", "10", "", "USD", "Москва", "2022-02-10T10:00:00+0300"]
+                ])
+            con = sqlite3.connect(":memory:")
+            self.assertEqual(script.load_vacancies(con, file_name, exchange_rates, job_names=["Программист"]), 2)
+            self.assertEqual(con.execute("select name, salary, area_name from vacancies").fetchall(),
+                             [("Программист", 100, ""), ("", 600, "Москва")])
+            self.assertEqual(con.execute("select sum(vacancies_count) from year_area_salaries").fetchone()[0], 2)
+            con.close()
+
+    def test_short_job_names(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.5.2", "3.5.2.py"))
+        exchange_rates = ExchangeRates.from_constants({"USD": 60})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([
+                    ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                    ["Программист 1С", "100", "", "RUR", "Москва", "2022-01-10T10:00:00+0300"],
+                    ["QA engineer", "10", "", "USD", "Казань", "2022-02-10T10:00:00+0300"],
+                    ["Senior qa", "300", "", "RUR", "Казань", "2021-02-10T10:00:00+0300"]
+                ])
+            con = sqlite3.connect(":memory:")
+            script.load_vacancies(con, file_name, exchange_rates, job_names=["1С", "QA", "Программист"])
+            self.assertEqual(con.execute("select job_name, year, salary_sum, vacancies_count from year_job_salaries "
+                                         "order by job_name, year").fetchall(),
+                             [("1С", 2022, 100, 1), ("QA", 2021, 300, 1), ("QA", 2022, 600, 1),
+                              ("Программист", 2022, 100, 1)])
+            con.close()
+
+    def test_aggregates_match_vacancies(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.5.2", "3.5.2.py"))
+        exchange_rates = ExchangeRates.from_constants({"USD": 60, "EUR": 70})
+        names = ["Программист 1С", "QA engineer", "Ведущий программист", "Менеджер", "Java Developer", "Аналитик",
+                 "Инженер-программист", "1С разработчик"]
+        cities = ["Москва", "Казань", "Омск"]
+        currencies = ["RUR", "USD", "EUR"]
+        job_names = ["1С", "QA", "Программист", "программист", "Developer", "ер", "Дизайнер"]
+        with tempfile.TemporaryDirectory() as directory:
+            con = sqlite3.connect(":memory:")
+            for part in range(3):
+                file_name = os.path.join(directory, f"vacancies_{part}.csv")
+                with open(file_name, "w", encoding="utf_8", newline="") as file:
+                    csv.writer(file).writerows(
+                        [["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]] +
+                        [[names[(i * 7 + part) % len(names)], str(1000 * (i % 13 + 1)), "" if i % 3 else str(500 * i),
+                          currencies[i % 5 % 3], cities[(i + part) % 3],
+                          f"{2019 + (i + part) % 4}-0{i % 9 + 1}-10T10:00:00+0300"] for i in range(40)])
+                script.load_vacancies(con, file_name, exchange_rates, replace=part == 0, job_names=job_names[:4 + part])
+            script.add_job_names(con, job_names)
+            self.assertEqual(con.execute("select year, area_id, salary_sum, vacancies_count from year_area_salaries "
+                                         "order by year, area_id").fetchall(),
+                             con.execute("select year, area_id, sum(salary), count(*) from vacancies_data "
+                                         "group by year, area_id order by year, area_id").fetchall())
+            for job_name in job_names:
+                self.assertEqual(con.execute("select year, salary_sum, vacancies_count from year_job_salaries "
+                                             "where job_name = ? order by year", (job_name,)).fetchall(),
+                                 con.execute("select year, sum(salary), count(*) from vacancies where name like ? "
+                                             "group by year order by year", (f"%{job_name}%",)).fetchall())
+            con.close()
+
+    def test_aggregates_refresh_incrementally(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.5.2", "3.5.2.py"))
+        exchange_rates = ExchangeRates.from_constants({"USD": 60})
+        with tempfile.TemporaryDirectory() as directory:
+            file_names = []
+            for i, rows in enumerate([
+                [["Программист", "100", "", "RUR", "Москва", "2021-01-10T10:00:00+0300"],
+                 ["Менеджер", "200", "", "RUR", "Казань", "2021-03-10T10:00:00+0300"]],
+                [["Ведущий программист", "10", "", "USD", "Москва", "2021-05-10T10:00:00+0300"],
+                 ["Программист 1С", "300", "500", "RUR", "Омск", "2022-01-10T10:00:00+0300"]]
+            ]):
+                file_names.append(os.path.join(directory, f"vacancies_{i}.csv"))
+                with open(file_names[-1], "w", encoding="utf_8", newline="") as file:
+                    csv.writer(file).writerows(
+                        [["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]] + rows)
+            con = sqlite3.connect(":memory:")
+            script.load_vacancies(con, file_names[0], exchange_rates, job_names=["Программист"])
+            script.load_vacancies(con, file_names[1], exchange_rates, replace=False, job_names=["программист"])
+            self.assertEqual(script.add_job_names(con, ["Менеджер", "Программист"]), 1)
+            self.assertEqual(con.execute("select year, areas.name, salary_sum, vacancies_count from year_area_salaries "
+                                         "join areas on areas.id = area_id order by year, areas.name").fetchall(),
+                             [(2021, "Казань", 200, 1), (2021, "Москва", 700, 2), (2022, "Омск", 400, 1)])
+            self.assertEqual(con.execute("select job_name, year, salary_sum, vacancies_count from year_job_salaries "
+                                         "order by job_name, year").fetchall(),
+                             [("Менеджер", 2021, 200, 1), ("Программист", 2021, 100, 1), ("Программист", 2022, 400, 1),
+                              ("программист", 2021, 600, 1)])
+            con.close()
+
+
 class DataSetTest(TestCase):
     def test_remove_html_non_key_skills(self):
         to_remove_html_string = '<strong>Обязанности:</strong> <ul> <li>компьютерное моделирование деталей</li> <li>настройки параметров обработки деталей</li> <li>установка материала и съем готовой детали</li> <li>контроль и измерение деталей на соответствие размеров техническому заданию</li> </ul> <strong>Требования:</strong> <ul> <li>Образование Средне-специальное</li> <li>Умение пользоваться инструментом</li> <li>Умение читать чертежи</li> <li>Технический склад ума</li> </ul> <strong>Примечание:</strong> <ul> <li>Питание предоставляется. Возможно проживание</li> </ul>'
@@ -109,6 +614,53 @@ class DataSetTest(TestCase):
         self.assertEqual(formatted_vacancy_info, reference_formatted_vacancy_info)
 
 
+    def test_csv_rows_is_lazy_and_skips_incomplete_rows(self):
+        columns = test_columns
+        incomplete_vacancy_info = list(test_vacancy_info)
+        incomplete_vacancy_info[6] = ""
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8_sig", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerows([columns, test_vacancy_info, incomplete_vacancy_info, test_vacancy_info_eur])
+            rows = DataSet.csv_rows(file_name)
+            self.assertEqual(type(rows).__name__, "generator")
+            self.assertEqual([row.name for row in rows], ["Оператор ЧПУ", "Senior Python Developer (Crypto)"])
+
+
+    def test_csv_chunks_respect_quoted_newlines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8_sig", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(test_columns)
+                writer.writerows([test_vacancy_info, test_vacancy_info_eur] * 5)
+            columns, chunks = DataSet.get_csv_chunks(file_name, 7)
+            self.assertEqual(columns, test_columns)
+            rows = [row for chunk in chunks for row in DataSet.read_csv_chunk(file_name, *chunk)]
+            self.assertEqual(rows, [test_vacancy_info, test_vacancy_info_eur] * 5)
+            records = [record.name for chunk in chunks for record in DataSet.parse_csv_chunk(file_name, columns, *chunk, [])[1]]
+            self.assertEqual(records, [record.name for record in DataSet.csv_rows(file_name)])
+
+    def test_parallel_stream_reports_no_matches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8_sig", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(test_columns)
+                writer.writerows([test_vacancy_info, test_vacancy_info_eur] * 5)
+            records = DataSet.csv_stream(file_name, parallel=True, criteria=["Название", "Оператор ЧПУ"])
+            self.assertEqual({record.name for record in records}, {"Оператор ЧПУ"})
+            for criteria, message in [(["Название", "Программист"], "Ничего не найдено"), ([], "Нет данных")]:
+                if len(criteria) == 0:
+                    with open(file_name, "w", encoding="utf_8_sig", newline="") as file:
+                        csv.writer(file).writerows([test_columns])
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output), self.assertRaises(SystemExit):
+                    DataSet.csv_stream(file_name, parallel=True, criteria=criteria)
+                self.assertEqual(output.getvalue().strip(), message)
+
+
 class InputConnectTests(TestCase):
     def test_compare_vacancy_with_criteria(self):
         vacancy_info_dict = dict(zip(['name',
@@ -137,6 +689,54 @@ class InputConnectTests(TestCase):
         formatted_vacancy_info = DataSet.formatter(vacancy_info_dict)
         self.assertFalse(InputConnect.compare_vacancy_info_with_criteria(formatted_vacancy_info, ["Оклад", "150000"]))
 
+    def test_parse_filter_criteria(self):
+        self.assertEqual(InputConnect.parse_filter_criteria("Навыки: Python, SQL"), ["Навыки", ["Python", "SQL"]])
+        self.assertEqual(InputConnect.parse_filter_criteria("Оклад: 100000; Название региона: Москва | Опыт работы: Нет опыта"),
+                         ["ИЛИ", [["И", [["Оклад", "100000"], ["Название региона", "Москва"]]], ["Опыт работы", "Нет опыта"]]])
+
+    def test_compiled_filter_criteria(self):
+        record = VacancyRecord(dict(zip(test_columns, test_vacancy_info)))
+        criterias = {
+            "Оклад: 75000": True,
+            "Оклад: 150000": False,
+            "Навыки: MS Dos": True,
+            "Навыки: MS Dos, Python": False,
+            "Идентификатор валюты оклада: Рубли": True,
+            "Дата публикации вакансии: 06.07.2022": True,
+            "Опыт работы: От 1 года до 3 лет": True,
+            "Премиум-вакансия: Нет": True,
+            "Название региона: Артем": True,
+            "Название региона: Москва; Оклад: 75000": False,
+            "Название региона: Москва | Оклад: 75000": True,
+        }
+        for criteria, expected in criterias.items():
+            predicate = InputConnect.compile_filter_criteria(InputConnect.parse_filter_criteria(criteria))
+            self.assertEqual(predicate(record), expected, criteria)
+
+    def test_record_sort_key_matches_formatted_sort(self):
+        eur_vacancy_info = list(test_vacancy_info_eur)
+        eur_vacancy_info[11] = '2022-07-06T01:03:11+0200'
+        records = [VacancyRecord(dict(zip(test_columns, x))) for x in [test_vacancy_info, eur_vacancy_info, test_vacancy_info]]
+        for criteria in ["Оклад", "Навыки", "Дата публикации вакансии", "Опыт работы", "Премиум-вакансия", "Название"]:
+            formatted_records = [DataSet.formatter(record.to_row()) for record in records]
+            expected = sorted(formatted_records, key=InputConnect.get_lambda(criteria))
+            actual = [DataSet.formatter(record.to_row())
+                      for record in InputConnect.get_sorted_vacancies(records, criteria, False)]
+            self.assertEqual(actual, expected, criteria)
+
+
+    def test_sorted_vacancies_with_limit(self):
+        records = []
+        for i, salary in enumerate([5, 3, 5, 1, 3, 5, 2]):
+            vacancy_info = dict(zip(test_columns, test_vacancy_info))
+            vacancy_info.update({"name": str(i), "salary_from": salary, "salary_to": salary})
+            records.append(VacancyRecord(vacancy_info))
+        for reversed in [False, True]:
+            expected = [x.name for x in InputConnect.get_sorted_vacancies(records, "Оклад", reversed)[:4]]
+            actual = [x.name for x in InputConnect.get_sorted_vacancies(iter(records), "Оклад", reversed, 4)]
+            self.assertEqual(actual, expected)
+
+
 class StatisticsTests(TestCase):
     def test_prepare_statistic(self):
         statistics = Statistics()
@@ -186,3 +786,117 @@ class StatisticsTests(TestCase):
             reference_years_vacancies_counts
         ]
         self.assertEqual(result, reference_values)
+
+    def test_accumulator_merge(self):
+        vacancies_info = test_vacancies_info * 3 + [Vacancy(test_vacancy_info_eur)]
+        statistics = Statistics()
+        statistics.prepare(vacancies_info, "Python")
+        accumulator = StatisticsAccumulator("Python").update(vacancies_info[:3])
+        accumulator.merge(StatisticsAccumulator("Python").update(vacancies_info[3:]))
+        self.assertEqual(accumulator.vacancies_count, 7)
+        self.assertEqual(accumulator.job_years_vacancies_counts, {2022: 4})
+        self.assertEqual(accumulator.finalize().get_prepared_statistics(), statistics.get_prepared_statistics())
+
+    def test_prepare_professions(self):
+        vacancies_info = test_vacancies_info * 3 + [Vacancy(test_vacancy_info_eur)]
+        job_names = ["Python", "ЧПУ", "Java"]
+        professions_statistics = Statistics.prepare_professions(VacancyTable.from_vacancies(vacancies_info), job_names)
+        self.assertEqual(list(professions_statistics), job_names)
+        for job_name in job_names:
+            statistics = Statistics()
+            statistics.prepare(vacancies_info, job_name)
+            self.assertEqual(professions_statistics[job_name].get_prepared_statistics(),
+                             statistics.get_prepared_statistics())
+        self.assertEqual(FileHandler.get_job_names("Python, ЧПУ,,Python "), ["Python", "ЧПУ"])
+
+    def test_empty_profession_matches_all_vacancies(self):
+        vacancies_table = VacancyTable.from_vacancies(test_vacancies_info * 3)
+        for raw_job_names in ["", "  ", " , "]:
+            self.assertEqual(FileHandler.get_job_names(raw_job_names), [raw_job_names])
+        statistics = Statistics()
+        statistics.prepare(vacancies_table, FileHandler.get_job_names("")[0])
+        prepared_statistics = statistics.get_prepared_statistics()
+        self.assertEqual(prepared_statistics[1], prepared_statistics[0])
+        self.assertEqual(prepared_statistics[3], prepared_statistics[2])
+        professions_statistics = Statistics.prepare_professions(vacancies_table, ["", "Python"])
+        self.assertEqual(professions_statistics[""].get_prepared_statistics(), prepared_statistics)
+        statistics = Statistics()
+        statistics.prepare(vacancies_table, FileHandler.get_job_names("  ")[0])
+        self.assertEqual(statistics.get_prepared_statistics()[3], {2022: 0})
+
+    def test_keyword_matcher(self):
+        keywords = ["Программист", "грам", "Python", "Python developer", "1С", "он"]
+        matcher = KeywordMatcher(keywords)
+        names = ["Программист 1С", "Python developer", "Pythonist", "Менеджер", "Программист Python"]
+        for name in names:
+            self.assertEqual(matcher.find(name), [i for i, keyword in enumerate(keywords) if keyword in name])
+        sums, counts = matcher.get_grouped_sums(names, np.array([0, 1, 4, 3, 0]), np.array([10, 20, 30, 40, 50]),
+                                                np.array([0, 0, 1, 1, 1]), 2)
+        self.assertEqual(sums.tolist(), [[10, 80], [10, 80], [20, 30], [20, 0], [10, 50], [0, 0]])
+        self.assertEqual(counts.tolist(), [[1, 2], [1, 2], [1, 1], [1, 0], [1, 1], [0, 0]])
+        matcher = KeywordMatcher(["", "Python"])
+        self.assertEqual([matcher.find(name) for name in ["", "Java", "Python"]], [[0], [0], [0, 1]])
+
+    def test_published_at(self):
+        dates = ["2022-07-05T18:19:30+0300", "2000-02-29T23:59:59-0530", "1999-12-31T00:00:00+0000"]
+        expected = [int(datetime.strptime(d, "%Y-%m-%dT%H:%M:%S%z").timestamp()) for d in dates]
+        self.assertEqual([PublishedAt.get_timestamp(d) for d in dates], expected)
+        self.assertEqual(PublishedAt.get_year(dates[0]), 2022)
+        self.assertEqual(PublishedAt.get_years(dates).tolist(), [2022, 2000, 1999])
+        self.assertEqual(PublishedAt.get_months(dates).tolist(), [PublishedAt.get_month(d) for d in dates])
+        self.assertEqual(PublishedAt.get_month(dates[0]), 2022 * 12 + 6)
+        rows = [["Программист", "100", "200", "RUR", "Москва", d] for d in dates]
+        table, batch_table = VacancyTable(), VacancyTable()
+        for row in rows:
+            table.append(row)
+        batch_table.append_rows(rows)
+        self.assertEqual([column.tolist() for column in batch_table.get_columns()],
+                         [column.tolist() for column in table.get_columns()])
+
+    def test_year_statistics_for_several_professions(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.4.3", "3.4.3.py"))
+        script.init_year_statistics_worker(ExchangeRates.from_constants({"USD": 60}))
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "part_2022.csv")
+            with open(file_name, "w", encoding="utf_8", newline="") as file:
+                csv.writer(file).writerows([
+                    ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                    ["Программист Python", "100000", "", "RUR", "Москва", "2022-01-10T10:00:00+0300"],
+                    ["Python developer", "1000", "3000", "USD", "Казань", "2022-02-10T10:00:00+0300"],
+                    ["Менеджер", "30000", "", "RUR", "Москва", "2022-02-11T10:00:00+0300"]
+                ])
+            self.assertEqual(script.get_year_statistics(file_name, ["Python", "Менеджер", "Java"]),
+                             ["2022", 83333, 3, {"Python": 110000, "Менеджер": 30000, "Java": 0},
+                              {"Python": 2, "Менеджер": 1, "Java": 0}])
+            self.assertEqual(script.get_year_statistics(file_name, [""]), ["2022", 83333, 3, {"": 83333}, {"": 3}])
+
+
+class YearPartitionsTests(TestCase):
+    def test_csv_and_parquet_partitions_match(self):
+        script = load_script(os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.4.3", "3.4.3.py"))
+        script.init_year_statistics_worker(ExchangeRates.from_constants({"USD": 60}))
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "vacancies.csv")
+            with open(file_name, "w", encoding="utf_8_sig", newline="") as file:
+                csv.writer(file).writerows([
+                    ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                    ["Программист Python", "100000", "", "RUR", "Москва", "2021-01-10T10:00:00+0300"],
+                    ["Python developer", "1000", "3000", "USD", "Казань", "2022-02-10T10:00:00+0300"],
+                    ["Менеджер", "", "", "", "Москва", "2021-02-11T10:00:00+0300"],
+                    ["Программист", "50000", "70000", "RUR", "", "2022-03-12T10:00:00+0300"],
+                    ["Аналитик", "", "80000", "RUR", "Казань", "2023-04-13T10:00:00+0300"]
+                ])
+            for file_format in ["csv", "parquet"]:
+                YearPartitions.separate_csv(file_name, os.path.join(directory, file_format), file_format, chunk_size=2)
+            self.assertEqual(sorted(os.listdir(os.path.join(directory, "csv"))),
+                             ["part_2021.csv", "part_2022.csv", "part_2023.csv"])
+            self.assertEqual(sorted(os.listdir(os.path.join(directory, "parquet"))),
+                             ["part_2021.parquet", "part_2022.parquet", "part_2023.parquet"])
+            for year in ["2021", "2022", "2023"]:
+                parts = [os.path.join(directory, file_format, f"part_{year}.{file_format}")
+                         for file_format in ["csv", "parquet"]]
+                csv_part, parquet_part = [YearPartitions.read_part(part) for part in parts]
+                self.assertEqual(csv_part.astype(object).where(csv_part.notna(), None).values.tolist(),
+                                 parquet_part.astype(object).where(parquet_part.notna(), None).values.tolist())
+                self.assertEqual(script.get_year_statistics(parts[0], ["Python", "Программист"]),
+                                 script.get_year_statistics(parts[1], ["Python", "Программист"]))
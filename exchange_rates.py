@@ -0,0 +1,240 @@
+import csv
+import json
+import os
+import sqlite3
+import numpy as np
+from published_at import PublishedAt
+
+
+class ExchangeRates:
+    """
+    Класс для хранения курсов валют к рублю в виде плотного массива: строки соответствуют номерам месяцев,
+    столбцы - кодам валют, поэтому курс для любой пары (месяц, валюта) находится обращением по индексу
+
+    Attributes:
+        base_currency (str): Идентификатор рубля, курс которого всегда равен 1
+        currency_aliases (dict): Идентификаторы валют, которые считаются другой валютой
+        rates (np.ndarray): Курсы валют, NaN - курс за месяц неизвестен
+        currencies (list): Идентификаторы валют в порядке столбцов массива rates
+        first_month (int or None): Номер месяца первой строки массива rates, None - курсы не зависят от месяца
+    """
+    base_currency = "RUR"
+    currency_aliases = {"BYN": "BYR"}
+
+    def __init__(self, rates, currencies, first_month=None):
+        """
+        Инициализирует таблицу курсов, добавляя в нее рубль при необходимости
+        Args:
+            rates (np.ndarray): Двумерный массив курсов: месяцы x валюты
+            currencies (list): Идентификаторы валют в порядке столбцов
+            first_month (int or None): Номер месяца первой строки, None - таблица из одной строки для всех месяцев
+        """
+        currencies = list(currencies)
+        if ExchangeRates.base_currency not in currencies:
+            rates = np.hstack([rates, np.ones((len(rates), 1))])
+            currencies.append(ExchangeRates.base_currency)
+        self.rates = rates
+        self.currencies = currencies
+        self.first_month = first_month
+        self.__currencies_codes = {currency: code for code, currency in enumerate(currencies)}
+        for alias, currency in ExchangeRates.currency_aliases.items():
+            if alias not in self.__currencies_codes and currency in self.__currencies_codes:
+                self.__currencies_codes[alias] = self.__currencies_codes[currency]
+
+    @staticmethod
+    def get_month(published_at):
+        """
+        Возвращает номер месяца по дате вида "ГГГГ-ММ..."
+        Args:
+            published_at (str): Дата публикации вакансии
+        Returns:
+            int: Номер месяца, считая от начала нашей эры
+        """
+        return PublishedAt.get_month(published_at)
+
+    @staticmethod
+    def get_months(published_at):
+        """
+        Возвращает номера месяцев для массива дат вида "ГГГГ-ММ...", разбирая цифры без создания строк
+        Args:
+            published_at (iterable): Даты публикации вакансий
+        Returns:
+            np.ndarray: Номера месяцев, считая от начала нашей эры
+        """
+        return PublishedAt.get_months(published_at)
+
+    def get_currency_codes(self, currencies):
+        """
+        Возвращает номера столбцов для массива идентификаторов валют
+        Args:
+            currencies (iterable): Идентификаторы валют
+        Returns:
+            np.ndarray: Номера столбцов массива rates, -1 для неизвестных валют
+        """
+        currencies_codes = self.__currencies_codes
+        return np.array([currencies_codes.get(currency, -1) for currency in currencies], dtype=np.int64)
+
+    def get_rates(self, months, currency_codes, unknown_currency_rate=np.nan):
+        """
+        Возвращает курсы для массивов номеров месяцев и номеров валют
+        Args:
+            months (np.ndarray or None): Номера месяцев, None - если курсы не зависят от месяца
+            currency_codes (np.ndarray): Номера столбцов, полученные методом get_currency_codes
+            unknown_currency_rate (float): Курс для неизвестных валют
+        Returns:
+            np.ndarray: Курсы валют, NaN - курс за месяц неизвестен
+        """
+        currency_codes = np.asarray(currency_codes)
+        if self.first_month is None:
+            rows = np.zeros(len(currency_codes), dtype=np.int64)
+        else:
+            rows = np.asarray(months) - self.first_month
+        known = (rows >= 0) & (rows < len(self.rates)) & (currency_codes >= 0)
+        result = np.full(len(currency_codes), np.nan)
+        result[known] = self.rates[rows[known], currency_codes[known]]
+        result[currency_codes < 0] = unknown_currency_rate
+        result[currency_codes == self.__currencies_codes[ExchangeRates.base_currency]] = 1
+        return result
+
+    def get_rate(self, currency, month=None):
+        """
+        Возвращает курс одной валюты
+        Args:
+            currency (str): Идентификатор валюты
+            month (int or None): Номер месяца, None - если курсы не зависят от месяца
+        Returns:
+            float: Курс валюты, NaN - если он неизвестен
+        """
+        code = self.__currencies_codes.get(currency, -1)
+        if code < 0:
+            return np.nan
+        if self.currencies[code] == ExchangeRates.base_currency:
+            return 1
+        row = 0 if self.first_month is None else month - self.first_month
+        if not 0 <= row < len(self.rates):
+            return np.nan
+        return float(self.rates[row, code])
+
+    def convert(self, amounts, months, currencies, unknown_currency_rate=np.nan):
+        """
+        Переводит суммы в рубли по курсам месяцев, в которые они указаны
+        Args:
+            amounts (np.ndarray): Суммы в исходных валютах
+            months (np.ndarray or None): Номера месяцев, None - если курсы не зависят от месяца
+            currencies (iterable): Идентификаторы валют
+            unknown_currency_rate (float): Курс для неизвестных валют
+        Returns:
+            np.ndarray: Суммы в рублях
+        """
+        rates = self.get_rates(months, self.get_currency_codes(currencies), unknown_currency_rate)
+        return np.asarray(amounts, dtype=float) * rates
+
+    def convert_salaries(self, salary_from, salary_to, published_at, currencies, unknown_currency_rate=0):
+        """
+        Переводит в рубли средние зарплаты вакансий: если одна из границ вилки не указана, берется другая
+        Args:
+            salary_from (iterable): Нижние границы вилок, NaN - граница не указана
+            salary_to (iterable): Верхние границы вилок, NaN - граница не указана
+            published_at (iterable): Даты публикации вакансий, по месяцам которых выбираются курсы
+            currencies (iterable): Идентификаторы валют
+            unknown_currency_rate (float): Курс для неизвестных валют
+        Returns:
+            np.ndarray: Средние зарплаты в рублях, NaN - если не указана ни одна граница или курс неизвестен
+        """
+        salary_from = np.asarray(salary_from, dtype=float)
+        salary_to = np.asarray(salary_to, dtype=float)
+        salary = 0.5 * (np.where(np.isnan(salary_from), salary_to, salary_from) +
+                        np.where(np.isnan(salary_to), salary_from, salary_to))
+        months = None if self.first_month is None else PublishedAt.get_months(published_at)
+        return self.convert(salary, months, currencies, unknown_currency_rate)
+
+    @staticmethod
+    def from_constants(currencies_rates):
+        """
+        Создает таблицу курсов, не зависящих от месяца
+        Args:
+            currencies_rates (dict): Курсы валют, ключи - идентификаторы валют
+        Returns:
+            ExchangeRates: Таблица курсов
+        """
+        return ExchangeRates(np.array([list(currencies_rates.values())], dtype=float), currencies_rates.keys())
+
+    @staticmethod
+    def from_rows(columns, rows):
+        """
+        Создает таблицу курсов по строкам вида (дата "ММ-ГГГГ", курсы валют), месяцы без данных заполняются NaN
+        Args:
+            columns (list): Названия столбцов, в том числе "date"
+            rows (iterable): Строки таблицы курсов
+        Returns:
+            ExchangeRates: Таблица курсов
+        """
+        date_index = columns.index("date")
+        currencies = [column for column in columns if column != "date"]
+        months_rates = {}
+        for row in rows:
+            month = int(row[date_index][3:7]) * 12 + int(row[date_index][0:2]) - 1
+            months_rates[month] = [float(value) if value not in ("", None) else np.nan
+                                   for i, value in enumerate(row) if i != date_index]
+        if len(months_rates) == 0:
+            return ExchangeRates(np.empty((0, len(currencies))), currencies, 0)
+        first_month = min(months_rates)
+        rates = np.full((max(months_rates) - first_month + 1, len(currencies)), np.nan)
+        for month, month_rates in months_rates.items():
+            rates[month - first_month] = month_rates
+        return ExchangeRates(rates, currencies, first_month)
+
+    @staticmethod
+    def from_csv(file_name):
+        """
+        Загружает таблицу курсов из CSV-файла со столбцом "date" и столбцами валют
+        Args:
+            file_name (str): Название CSV-файла
+        Returns:
+            ExchangeRates: Таблица курсов
+        """
+        with open(file_name, encoding="utf_8_sig", newline="") as file:
+            reader = csv.reader(file)
+            return ExchangeRates.from_rows(next(reader), reader)
+
+    @staticmethod
+    def from_sqlite(file_name, table_name="cb_currencies"):
+        """
+        Загружает таблицу курсов из базы данных SQLite одним запросом
+        Args:
+            file_name (str): Название файла базы данных
+            table_name (str): Название таблицы курсов
+        Returns:
+            ExchangeRates: Таблица курсов
+        """
+        connection = sqlite3.connect(file_name)
+        try:
+            cursor = connection.execute(f'select * from "{table_name}"')
+            return ExchangeRates.from_rows([column[0] for column in cursor.description], cursor)
+        finally:
+            connection.close()
+
+    def save(self, directory):
+        """
+        Сохраняет таблицу курсов в папку в виде файла .npy и JSON-файла с идентификаторами валют
+        Args:
+            directory (str): Папка, в которую нужно сохранить таблицу
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "rates.npy"), self.rates)
+        with open(os.path.join(directory, "currencies.json"), "w", encoding="utf_8") as file:
+            json.dump({"currencies": self.currencies, "first_month": self.first_month}, file)
+
+    @staticmethod
+    def load(directory):
+        """
+        Загружает таблицу курсов, сохраненную методом save. Массив курсов отображается в память.
+        Args:
+            directory (str): Папка с сохраненной таблицей
+        Returns:
+            ExchangeRates: Загруженная таблица
+        """
+        with open(os.path.join(directory, "currencies.json"), encoding="utf_8") as file:
+            meta = json.load(file)
+        return ExchangeRates(np.load(os.path.join(directory, "rates.npy"), mmap_mode="r"),
+                             meta["currencies"], meta["first_month"])
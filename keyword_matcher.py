@@ -0,0 +1,116 @@
+from collections import deque
+import numpy as np
+
+
+class KeywordMatcher:
+    """
+    Класс для поиска сразу всех ключевых слов в строке по автомату Ахо-Корасик: строка просматривается один раз,
+    сколько бы ключевых слов ни было задано. Используется для разметки названий вакансий профессиями
+
+    Attributes:
+        keywords (list): Ключевые слова, номер слова - его позиция в списке
+    """
+    def __init__(self, keywords):
+        """
+        Строит автомат по списку ключевых слов
+        Args:
+            keywords (iterable): Ключевые слова; пустое слово встречается в любой строке
+        """
+        self.keywords = list(keywords)
+        self.__transitions = [{}]
+        self.__outputs = [()]
+        for code, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.__transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.__transitions)
+                    self.__transitions[state][char] = next_state
+                    self.__transitions.append({})
+                    self.__outputs.append(())
+                state = next_state
+            self.__outputs[state] += (code,)
+
+        # Суффиксные ссылки строятся обходом в ширину, к выходам состояния добавляются выходы его ссылки,
+        # поэтому при поиске ключевые слова берутся только из текущего состояния. Сами переходы по ссылкам
+        # выполняются в find при несовпадении символа, на всю строку их приходится не больше ее длины
+        fail = [0] * len(self.__transitions)
+        queue = deque(self.__transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.__transitions[state].items():
+                fail_state = fail[state]
+                while fail_state and char not in self.__transitions[fail_state]:
+                    fail_state = fail[fail_state]
+                fail[next_state] = self.__transitions[fail_state].get(char, 0)
+                self.__outputs[next_state] += self.__outputs[fail[next_state]]
+                queue.append(next_state)
+        self.__fail = fail
+
+    def find(self, text):
+        """
+        Возвращает номера ключевых слов, которые встречаются в строке
+        Args:
+            text (str): Строка
+        Returns:
+            list: Номера ключевых слов по возрастанию, каждый номер один раз
+        """
+        transitions = self.__transitions
+        outputs = self.__outputs
+        fail = self.__fail
+        state = 0
+        found = set(outputs[0])
+        for char in text:
+            next_state = transitions[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = transitions[state].get(char)
+            state = next_state or 0
+            if outputs[state]:
+                found.update(outputs[state])
+        return sorted(found)
+
+    def tag(self, names):
+        """
+        Размечает названия ключевыми словами
+        Args:
+            names (list): Уникальные названия
+        Returns:
+            np.ndarray: Номера названий для каждой найденной пары (название, ключевое слово)
+            np.ndarray: Номера ключевых слов для тех же пар
+        """
+        names_codes = []
+        keywords_codes = []
+        for name_code, name in enumerate(names):
+            for keyword_code in self.find(name):
+                names_codes.append(name_code)
+                keywords_codes.append(keyword_code)
+        return np.array(names_codes, dtype=np.int64), np.array(keywords_codes, dtype=np.int64)
+
+    def get_grouped_sums(self, names, names_codes, values, groups_codes=None, groups_count=1):
+        """
+        Считает суммы значений и количества строк для каждого ключевого слова и группы.
+        Строки сначала группируются по уникальным названиям, затем суммы названий переносятся на их ключевые слова,
+        поэтому каждое название размечается один раз
+        Args:
+            names (list): Уникальные названия
+            names_codes (np.ndarray): Номера названий строк в списке names
+            values (np.ndarray): Значения строк
+            groups_codes (np.ndarray or None): Номера групп строк (например, годов), None - одна группа
+            groups_count (int): Количество групп
+        Returns:
+            np.ndarray: Суммы значений размером (количество ключевых слов, groups_count)
+            np.ndarray: Количества строк того же размера
+        """
+        codes = np.asarray(names_codes, dtype=np.int64) * groups_count
+        if groups_codes is not None:
+            codes = codes + groups_codes
+        size = len(names) * groups_count
+        names_sums = np.bincount(codes, weights=values, minlength=size).reshape(len(names), groups_count)
+        names_counts = np.bincount(codes, minlength=size).reshape(len(names), groups_count)
+        pairs_names, pairs_keywords = self.tag(names)
+        sums = np.zeros((len(self.keywords), groups_count), dtype=names_sums.dtype)
+        counts = np.zeros((len(self.keywords), groups_count), dtype=np.int64)
+        np.add.at(sums, pairs_keywords, names_sums[pairs_names])
+        np.add.at(counts, pairs_keywords, names_counts[pairs_names])
+        return sums, counts
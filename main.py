@@ -1,10 +1,22 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 import csv
-from datetime import datetime
+import hashlib
+import heapq
+import io
+import itertools
+import json
 import math
+import os
 import re
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import IndexLocator
 from prettytable import PrettyTable
+from exchange_rates import ExchangeRates
+from name_index import NameIndex
+from keyword_matcher import KeywordMatcher
+from published_at import PublishedAt
 from unittest import TestCase
 
 
@@ -73,22 +85,135 @@ currencies_exchanges = {
     "Узбекский сум": 0.0055,
 }
 
+fixed_exchange_rates = ExchangeRates.from_constants(
+    {currency: currencies_exchanges[currency_name] for currency, currency_name in currencies.items()})
+
+text_columns = [
+    "name",
+    "description",
+    "key_skills",
+    "employer_name"
+]
+
+html_tag_pattern = re.compile(r"<[^>]+>")
+
+parallel_parsing_min_file_size = 64 * 1024 * 1024
+table_rows_batch_size = 64 * 1024
+
+class VacancyRecord:
+    """
+    Класс для хранения данных о вакансии в типизированном виде, пригодном для фильтрации без разбора строк
+
+    Attributes:
+        name (str): Название вакансии
+        description (str): Описание вакансии
+        key_skills (str): Навыки вакансии, разделенные переносом строки
+        skills (frozenset): Множество навыков вакансии
+        experience_id (str): Идентификатор требуемого опыта работы
+        premium (bool): Является ли вакансия премиум-вакансией
+        employer_name (str): Название компании
+        salary_from (int): Нижняя граница оклада
+        salary_to (int): Верхняя граница оклада
+        salary_gross (bool): Указан ли оклад без вычета налогов
+        salary_currency (str): Идентификатор валюты оклада
+        area_name (str): Название региона
+        published_at (str): Дата публикации вакансии
+    """
+    __slots__ = ("name", "description", "key_skills", "skills", "experience_id", "premium", "employer_name",
+                 "salary_from", "salary_to", "salary_gross", "salary_currency", "area_name", "published_at")
+
+    def __init__(self, row):
+        """
+        Инициализирует внутреннее состояние обьекта по словарю с очищенными от HTML-тегов данными CSV-файла
+        Args:
+            row (dict): Словарь с информацией о вакансии, ключи - названия столбцов CSV-файла
+        """
+        self.name = row["name"]
+        self.description = row["description"]
+        self.key_skills = row["key_skills"]
+        self.skills = frozenset(self.key_skills.split("\n"))
+        self.experience_id = row["experience_id"]
+        self.premium = row["premium"] == "True"
+        self.employer_name = row["employer_name"]
+        self.salary_from = int(float(row["salary_from"]))
+        self.salary_to = int(float(row["salary_to"]))
+        self.salary_gross = row["salary_gross"] == "True"
+        self.salary_currency = row["salary_currency"]
+        self.area_name = row["area_name"]
+        self.published_at = row["published_at"]
+
+    def __getstate__(self):
+        """
+        Возвращает состояние объекта в виде кортежа, чтобы вакансии быстрее передавались между процессами
+        """
+        return tuple(getattr(self, attribute) for attribute in VacancyRecord.__slots__)
+
+    def __setstate__(self, state):
+        """
+        Восстанавливает состояние объекта из кортежа, полученного методом __getstate__
+        """
+        for attribute, value in zip(VacancyRecord.__slots__, state):
+            setattr(self, attribute, value)
+
+    def get_rouble_medium_salary(self):
+        """
+        Возвращает среднюю зарплату вакансии в рублях
+        Returns:
+            float: Средняя зарплата вакансии в рублях
+        """
+        return fixed_exchange_rates.get_rate(self.salary_currency) * (float(self.salary_from) + float(self.salary_to)) / 2
+
+    def get_published_at_timestamp(self):
+        """
+        Возвращает момент публикации вакансии в секундах, разбирая дату вида "ГГГГ-ММ-ДДTЧЧ:ММ:СС+ЧЧММ" срезами
+        Returns:
+            int: Количество секунд, прошедших с 01.01.1970 до момента публикации (по UTC)
+        """
+        return PublishedAt.get_timestamp(self.published_at)
+
+    def to_row(self):
+        """
+        Возвращает данные о вакансии в виде словаря, пригодного для DataSet.formatter
+        Returns:
+            dict: Словарь с информацией о вакансии, ключи - названия столбцов CSV-файла
+        """
+        return {
+            "name": self.name,
+            "description": self.description,
+            "key_skills": self.key_skills,
+            "experience_id": self.experience_id,
+            "premium": str(self.premium),
+            "employer_name": self.employer_name,
+            "salary_from": self.salary_from,
+            "salary_to": self.salary_to,
+            "salary_gross": str(self.salary_gross),
+            "salary_currency": self.salary_currency,
+            "area_name": self.area_name,
+            "published_at": self.published_at,
+        }
+
+
 class DataSet:
     """
-    Класс для преобразования данных CSV-файла в список обьектов Vacancy
+    Класс для преобразования данных CSV-файла в список обьектов VacancyRecord
 
     Attributes:
         file_name (str): Имя CSV-файла
         vacancies_objects (object): Список вакансий-объектов
     """
-    def __init__(self, file_name):
+    def __init__(self, file_name, lazy=False, parallel=False, criteria=()):
         """
         Инициализирует внутреннее состояние обьекта в соответствии с переданным именем файла
         Args:
             file_name (str): Имя CSV-файла
+            lazy (bool): Если True, вакансии считываются из файла лениво, по мере обхода
+            parallel (bool): Если True, файл разбирается по частям в нескольких процессах
+            criteria (list): Критерий фильтрации, который при параллельном разборе применяется в процессах пула
         """
         self.__file_name = file_name
-        self.__vacancies_objects = DataSet.csv_reader(file_name)
+        self.__vacancies_objects = DataSet.csv_stream(file_name, parallel, criteria)
+        if not lazy:
+            self.__vacancies_objects = list(self.__vacancies_objects)
 
     @property
     def file_name(self):
@@ -119,7 +244,65 @@ class DataSet:
         Returns:
             list: Список очищенных от HTML-тегов строк
         """
-        return [DataSet.remove_html(input[i], columns[i]) for i in range(len(input))]
+        return DataSet.get_cleaned_row(input, DataSet.get_column_cleaners(columns))
+
+    @staticmethod
+    def get_column_cleaners(columns):
+        """
+        Один раз для заголовка CSV-файла подбирает функцию очистки для каждого столбца:
+        HTML-теги удаляются только из текстовых столбцов, остальные столбцы не обрабатываются
+        Args:
+            columns (list): Названия столбцов
+        Returns:
+            list: Функции очистки столбцов (None - столбец не нуждается в очистке)
+        """
+        cleaners = []
+        for column in columns:
+            if column == "key_skills":
+                cleaners.append(DataSet.remove_html_lines)
+            elif column in text_columns:
+                cleaners.append(DataSet.remove_html_words)
+            else:
+                cleaners.append(None)
+        return cleaners
+
+    @staticmethod
+    def get_cleaned_row(row, cleaners):
+        """
+        Очищает строку CSV-файла функциями очистки столбцов
+        Args:
+            row (list): Значения столбцов
+            cleaners (list): Функции очистки столбцов, полученные из get_column_cleaners
+        Returns:
+            list: Очищенные значения столбцов
+        """
+        return [value if cleaner is None else cleaner(value) for value, cleaner in zip(row, cleaners)]
+
+    @staticmethod
+    def remove_html_lines(input):
+        """
+        Очищает строку от HTML-тегов, сохраняя разбиение на строки
+        Args:
+            input (str): Строка, которую нужно очистить от тегов
+        Returns:
+            str: Очищенная от HTML-тегов строка
+        """
+        if "<" in input:
+            input = html_tag_pattern.sub("", input)
+        return "\n".join(input.splitlines())
+
+    @staticmethod
+    def remove_html_words(input):
+        """
+        Очищает строку от HTML-тегов и лишних пробельных символов
+        Args:
+            input (str): Строка, которую нужно очистить от тегов
+        Returns:
+            str: Очищенная от HTML-тегов строка
+        """
+        if "<" in input:
+            input = html_tag_pattern.sub("", input)
+        return " ".join(input.split())
 
     @staticmethod
     def remove_html(input, column_name):
@@ -136,9 +319,9 @@ class DataSet:
 
         """
         if column_name == "key_skills":
-            return "\n".join(re.sub(r"<[^>]+>", "", input).splitlines())
+            return DataSet.remove_html_lines(input)
         else:
-            return " ".join(re.sub(r"<[^>]+>", "", input).split())
+            return DataSet.remove_html_words(input)
 
     @staticmethod
     def get_formatted_number(number_str):
@@ -203,24 +386,212 @@ class DataSet:
         return formatted_vacancy_data
 
     @staticmethod
-    def csv_reader(file_name):
+    def csv_rows(file_name):
         """
-        Считывает данные из CSV-файла
-        :param file_name: Имя CSV-файла
-        :return: Считанные из CSV-файла данные
+        Лениво считывает данные из CSV-файла, отдавая по одной вакансии за раз
+        Args:
+            file_name (str): Имя CSV-файла
+        Returns:
+            generator: Генератор вакансий-объектов VacancyRecord
+        """
+        with open(file_name, encoding="utf_8_sig") as file:
+            reader = csv.reader(file)
+            try:
+                columns = next(reader)
+            except StopIteration:
+                print("Пустой файл")
+                exit()
+            cleaners = DataSet.get_column_cleaners(columns)
+            for row in reader:
+                if len(row) == len(columns) and row.count("") == 0:
+                    yield VacancyRecord(dict(zip(columns, DataSet.get_cleaned_row(row, cleaners))))
+
+    @staticmethod
+    def get_csv_chunks(file_name, chunks_count):
+        """
+        Разбивает CSV-файл на диапазоны байтов, границы которых совпадают с границами записей.
+        Перевод строки считается границей записи, только если перед ним четное количество кавычек,
+        т.е. он не находится внутри значения в кавычках (в описаниях вакансий бывают переводы строк).
+        Args:
+            file_name (str): Имя CSV-файла
+            chunks_count (int): Желаемое количество частей
+        Returns:
+            list: Названия столбцов
+            list: Пары (начало, конец) диапазонов байтов с записями, без заголовка
+        """
+        file_size = os.path.getsize(file_name)
+        with open(file_name, "rb") as file:
+            header_end = DataSet.find_record_end(file, 0, 0)
+            file.seek(0)
+            columns = next(csv.reader([file.read(header_end).decode("utf_8_sig")]), [])
+            bounds = [header_end]
+            quotes_count = 0
+            position = header_end
+            for i in range(1, chunks_count):
+                target = header_end + (file_size - header_end) * i // chunks_count
+                if target <= position:
+                    continue
+                quotes_count += DataSet.count_quotes(file, position, target)
+                record_end = DataSet.find_record_end(file, target, quotes_count)
+                quotes_count += DataSet.count_quotes(file, target, record_end)
+                position = record_end
+                if position < file_size:
+                    bounds.append(position)
+        bounds.append(file_size)
+        return columns, list(zip(bounds[:-1], bounds[1:]))
+
+    @staticmethod
+    def count_quotes(file, start, end):
+        """
+        Считает количество кавычек в диапазоне байтов файла, читая его блоками
+        Args:
+            file (BinaryIO): Открытый в двоичном режиме файл
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+        Returns:
+            int: Количество кавычек
+        """
+        file.seek(start)
+        quotes_count = 0
+        while start < end:
+            block = file.read(min(1 << 20, end - start))
+            if not block:
+                break
+            quotes_count += block.count(b'"')
+            start += len(block)
+        return quotes_count
+
+    @staticmethod
+    def find_record_end(file, position, quotes_count):
+        """
+        Находит позицию сразу после ближайшего перевода строки, находящегося вне кавычек
+        Args:
+            file (BinaryIO): Открытый в двоичном режиме файл
+            position (int): Позиция, с которой начинается поиск
+            quotes_count (int): Количество кавычек в файле до позиции position
+        Returns:
+            int: Позиция начала следующей записи или конец файла
+        """
+        file.seek(position)
+        while True:
+            block = file.read(1 << 16)
+            if not block:
+                return position
+            for i, byte in enumerate(block):
+                if byte == 34:
+                    quotes_count += 1
+                elif byte == 10 and quotes_count % 2 == 0:
+                    return position + i + 1
+            position += len(block)
+
+    @staticmethod
+    def read_csv_chunk(file_name, start, end):
+        """
+        Считывает строки CSV-файла из диапазона байтов
+        Args:
+            file_name (str): Имя CSV-файла
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+        Returns:
+            csv.reader: Строки CSV-файла из диапазона
+        """
+        with open(file_name, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start).decode("utf_8")
+        return csv.reader(io.StringIO(data, newline=""))
+
+    @staticmethod
+    def parse_csv_chunk(file_name, columns, start, end, criteria):
         """
-        reader = csv.reader(open(file_name, encoding="utf_8_sig"))
-        columns = []
-        try:
-            columns = next(reader)
-        except StopIteration:
+        Разбирает вакансии из диапазона байтов CSV-файла. Выполняется в отдельном процессе.
+        Args:
+            file_name (str): Имя CSV-файла
+            columns (list): Названия столбцов
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+            criteria (list): Критерий фильтрации, применяемый до передачи вакансий в основной процесс
+        Returns:
+            int: Количество корректных вакансий в диапазоне до фильтрации
+            list: Вакансии-объекты VacancyRecord, удовлетворяющие критерию
+        """
+        cleaners = DataSet.get_column_cleaners(columns)
+        records = [VacancyRecord(dict(zip(columns, DataSet.get_cleaned_row(row, cleaners))))
+                   for row in DataSet.read_csv_chunk(file_name, start, end)
+                   if len(row) == len(columns) and row.count("") == 0]
+        if len(criteria) == 0:
+            return len(records), records
+        return len(records), list(filter(InputConnect.compile_filter_criteria(criteria), records))
+
+    @staticmethod
+    def csv_parallel_chunks(file_name, criteria=(), workers=None):
+        """
+        Разбирает части CSV-файла в пуле процессов. Порядок частей сохраняется.
+        Args:
+            file_name (str): Имя CSV-файла
+            criteria (list): Критерий фильтрации, применяемый в процессах пула
+            workers (int or None): Количество процессов (None - по числу ядер)
+        Returns:
+            generator: Генератор пар (количество корректных вакансий до фильтрации, отфильтрованные вакансии)
+        """
+        workers = workers or os.cpu_count() or 1
+        columns, chunks = DataSet.get_csv_chunks(file_name, workers * 4)
+        if len(columns) == 0:
             print("Пустой файл")
             exit()
-        data = [DataSet.formatter(dict(zip(columns, DataSet.get_filtered_vacancy_info(row, columns)))) for row in reader if len(row) == len(columns) and row.count("") == 0]
-        if len(data) == 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(DataSet.parse_csv_chunk, itertools.repeat(file_name), itertools.repeat(columns),
+                                    [chunk[0] for chunk in chunks], [chunk[1] for chunk in chunks],
+                                    itertools.repeat(criteria))
+
+    @staticmethod
+    def csv_parallel_stream(file_name, criteria=(), workers=None):
+        """
+        Считывает данные из CSV-файла, разбирая его части в пуле процессов. Порядок вакансий сохраняется.
+        Завершает программу, если в файле нет корректных вакансий или ни одна из них не удовлетворяет критерию
+        Args:
+            file_name (str): Имя CSV-файла
+            criteria (list): Критерий фильтрации, применяемый в процессах пула
+            workers (int or None): Количество процессов (None - по числу ядер)
+        Returns:
+            generator: Генератор вакансий-объектов VacancyRecord
+        """
+        chunks = DataSet.csv_parallel_chunks(file_name, criteria, workers)
+        parsed_count = 0
+        for chunk_parsed_count, records in chunks:
+            parsed_count += chunk_parsed_count
+            if len(records) > 0:
+                return itertools.chain(records, itertools.chain.from_iterable(records for _, records in chunks))
+        print("Нет данных" if parsed_count == 0 else "Ничего не найдено")
+        exit()
+
+    @staticmethod
+    def csv_stream(file_name, parallel=False, criteria=()):
+        """
+        Лениво считывает данные из CSV-файла, завершая программу, если в файле нет ни одной корректной вакансии
+        Args:
+            file_name (str): Имя CSV-файла
+            parallel (bool): Если True, файл разбирается по частям в нескольких процессах
+            criteria (list): Критерий фильтрации, который при параллельном разборе применяется в процессах пула
+        Returns:
+            generator: Генератор вакансий-объектов VacancyRecord
+        """
+        if parallel:
+            return DataSet.csv_parallel_stream(file_name, criteria)
+        rows = DataSet.csv_rows(file_name)
+        first_row = next(rows, None)
+        if first_row is None:
             print("Нет данных")
             exit()
-        return data
+        return itertools.chain([first_row], rows)
+
+    @staticmethod
+    def csv_reader(file_name):
+        """
+        Считывает данные из CSV-файла
+        :param file_name: Имя CSV-файла
+        :return: Считанные из CSV-файла данные
+        """
+        return list(DataSet.csv_stream(file_name))
 
 
 class InputConnect:
@@ -305,25 +676,41 @@ class InputConnect:
     @staticmethod
     def parse_filter_criteria(input):
         """
-        Обрабатывает данные о критерии фильтрации
+        Обрабатывает данные о критерии фильтрации.
+        Критерии можно объединять: "; " - логическое И, " | " - логическое ИЛИ (И выполняется раньше ИЛИ)
         Args:
             input (str): "Грязные" данные о критерии фильтрации
         Returns:
-            list: Обработанные данные о критерии фильтрации
+            list: Обработанные данные о критерии фильтрации. Составной критерий имеет вид ["И", [...]] или ["ИЛИ", [...]]
         """
         if input.strip() == "":
             return []
+        alternatives = []
+        for alternative in input.split(" | "):
+            conjuncts = [InputConnect.parse_single_filter_criteria(x) for x in alternative.split("; ")]
+            alternatives.append(conjuncts[0] if len(conjuncts) == 1 else ["И", conjuncts])
+        return alternatives[0] if len(alternatives) == 1 else ["ИЛИ", alternatives]
+
+    @staticmethod
+    def parse_single_filter_criteria(input):
+        """
+        Обрабатывает данные об одном критерии фильтрации
+        Args:
+            input (str): "Грязные" данные о критерии фильтрации
+        Returns:
+            list: Название столбца и значение, для навыков - список навыков
+        """
         if ":" not in input:
             print("Формат ввода некорректен")
             exit()
-        splitted_input = input.split(": ")
+        splitted_input = input.split(": ", 1)
         column_name = splitted_input[0]
-        if column_name not in filter_criterias:
+        if column_name not in filter_criterias or len(splitted_input) < 2:
             print("Параметр поиска некорректен")
             exit()
         if column_name == "Навыки":
-            splitted_input = splitted_input[1].split(", ")
-        return [splitted_input[0], splitted_input[1]]
+            return [column_name, splitted_input[1].split(", ")]
+        return [column_name, splitted_input[1]]
 
     @staticmethod
     def parse_sort_criteria(input):
@@ -372,18 +759,15 @@ class InputConnect:
         """
         Фильтрует поданные на вход вакансии в соответствии с критерием
         Args:
-        vacancies_info (list): Список данных о вакансиях, который нужно обработать
-        criteria (str): Строка, содержащая критерий фильтрации
+        vacancies_info (list): Список вакансий-объектов VacancyRecord, который нужно обработать
+        criteria (list): Критерий фильтрации
 
         Returns:
              list: Отфильтрованные вакансии
         """
         if len(criteria) == 0:
             return vacancies_info
-        filtered_vacancies_info = []
-        for vacancy_info in vacancies_info:
-            if InputConnect.compare_vacancy_info_with_criteria(vacancy_info, criteria):
-                filtered_vacancies_info.append(vacancy_info)
+        filtered_vacancies_info = list(filter(InputConnect.compile_filter_criteria(criteria), vacancies_info))
         if len(filtered_vacancies_info) == 0:
             print("Ничего не найдено")
             exit()
@@ -419,6 +803,78 @@ class InputConnect:
             return date == criteria[1]
         return vacancy_info[criteria[0]] == criteria[1]
 
+    @staticmethod
+    def compile_filter_criteria(criteria):
+        """
+        Один раз преобразует критерий фильтрации в функцию-предикат над вакансиями-объектами VacancyRecord,
+        чтобы при проверке каждой вакансии не разбирать строки заново
+        Args:
+            criteria (list): Критерий фильтрации, в том числе составной
+        Returns:
+            function: Предикат, возвращающий True, если вакансия удовлетворяет критерию
+        """
+        column_name, value = criteria
+        if column_name in ["И", "ИЛИ"]:
+            predicates = [InputConnect.compile_filter_criteria(x) for x in value]
+            if column_name == "И":
+                return lambda record: all(predicate(record) for predicate in predicates)
+            return lambda record: any(predicate(record) for predicate in predicates)
+        if column_name == "Навыки":
+            required_skills = frozenset(value)
+            return lambda record: required_skills <= record.skills
+        if column_name == "Оклад":
+            salary = float(value)
+            return lambda record: record.salary_from <= salary <= record.salary_to
+        if column_name == "Идентификатор валюты оклада":
+            currency = next((code for code, name in currencies.items() if name == value), None)
+            return lambda record: record.salary_currency == currency
+        if column_name == "Дата публикации вакансии":
+            if re.fullmatch(r"\d{2}\.\d{2}\.\d{4}", value):
+                date_prefix = f"{value[6:]}-{value[3:5]}-{value[:2]}"
+                return lambda record: record.published_at.startswith(date_prefix)
+            return lambda record: InputConnect.get_normalized_date(record.published_at) == value
+        if column_name == "Опыт работы":
+            experience_id = next((key for key, name in job_experience.items() if name == value), None)
+            return lambda record: record.experience_id == experience_id
+        if column_name == "Премиум-вакансия":
+            if value not in ["Да", "Нет"]:
+                return lambda record: False
+            premium = value == "Да"
+            return lambda record: record.premium == premium
+        attribute = {v: k for k, v in formatted_russian_columns.items()}[column_name]
+        return lambda record: getattr(record, attribute) == value
+
+    @staticmethod
+    def get_filtered_vacancies_stream(vacancies_info, criteria):
+        """
+        Лениво фильтрует поданные на вход вакансии в соответствии с критерием, не накапливая их в памяти
+        Args:
+            vacancies_info (iterable): Вакансии-объекты VacancyRecord, которые нужно обработать
+            criteria (list): Критерий фильтрации
+        Returns:
+            iterator: Отфильтрованные вакансии
+        """
+        if len(criteria) == 0:
+            filtered_vacancies_info = iter(vacancies_info)
+        else:
+            filtered_vacancies_info = filter(InputConnect.compile_filter_criteria(criteria), vacancies_info)
+        first_vacancy_info = next(filtered_vacancies_info, None)
+        if first_vacancy_info is None:
+            print("Ничего не найдено")
+            exit()
+        return itertools.chain([first_vacancy_info], filtered_vacancies_info)
+
+    def get_vacancies_range_bounds(self):
+        """
+        Возвращает границы диапазона вывода в виде, пригодном для среза
+        Returns:
+            tuple: Индекс первой выводимой вакансии и индекс, перед которым вывод заканчивается (None - до конца)
+        """
+        vacancies_range = self.parsed_input["Диапазон вывода"]
+        if len(vacancies_range) == 1:
+            return 0, None
+        return vacancies_range[0], vacancies_range[1]
+
     @staticmethod
     def get_rouble_medium_salary(vacancy_info):
         """
@@ -459,25 +915,55 @@ class InputConnect:
         elif criteria == "Навыки":
             return lambda d: InputConnect.get_vacancy_skills_count(d)
         elif criteria == "Дата публикации вакансии":
-            return lambda d: datetime.strptime(d["Дата публикации вакансии"], '%Y-%m-%dT%H:%M:%S%z')
+            return lambda d: PublishedAt.get_timestamp(d["Дата публикации вакансии"])
         elif criteria == "Опыт работы":
             return lambda d: job_experience_priority[d["Опыт работы"]]
         return lambda d: d[criteria]
 
     @staticmethod
-    def get_sorted_vacancies(vacancies_info, sort_criteria, reversed):
+    def get_record_sort_key(criteria):
+        """
+        Возвращает функцию, вычисляющую ключ сортировки по типизированным полям вакансии-объекта VacancyRecord.
+        Порядок, задаваемый ключом, совпадает с порядком, задаваемым get_lambda для отформатированных вакансий.
+        Args:
+            criteria (str): Критерий сортировки
+        Returns:
+            function: Функция для вычисления ключа сортировки
+        """
+        if criteria == "Оклад":
+            return VacancyRecord.get_rouble_medium_salary
+        elif criteria == "Навыки":
+            return lambda record: record.key_skills.count("\n") + 1
+        elif criteria == "Дата публикации вакансии":
+            return VacancyRecord.get_published_at_timestamp
+        elif criteria == "Опыт работы":
+            experience_priority = {key: job_experience_priority[name] for key, name in job_experience.items()}
+            return lambda record: experience_priority[record.experience_id]
+        elif criteria == "Премиум-вакансия":
+            return lambda record: "Да" if record.premium else "Нет"
+        attribute = {v: k for k, v in formatted_russian_columns.items()}[criteria]
+        return lambda record: getattr(record, attribute)
+
+    @staticmethod
+    def get_sorted_vacancies(vacancies_info, sort_criteria, reversed, limit=None):
         """
-        Сортирует вакансии по критерию
+        Сортирует вакансии по критерию. Если задан limit, с помощью кучи отбираются только первые limit вакансий,
+        что не требует сортировки всего списка и хранения всех вакансий в памяти
         Args:
-            vacancies_info (list): Список вакансии
+            vacancies_info (iterable): Вакансии-объекты VacancyRecord
+            sort_criteria (str): Критерий сортировки
+            reversed (bool): True, если порядок сортировки обратный
+            limit (int or None): Количество первых вакансий, которые нужно вернуть (None - все)
 
         Returns:
             list: отсортированный по указанному критерию список вакансий
         """
         if len(sort_criteria) == 0:
             return vacancies_info
-        proper_lambda = InputConnect.get_lambda(sort_criteria)
-        return sorted(vacancies_info, key=proper_lambda, reverse=reversed)
+        sort_key = InputConnect.get_record_sort_key(sort_criteria)
+        if limit is not None:
+            return (heapq.nlargest if reversed else heapq.nsmallest)(limit, vacancies_info, key=sort_key)
+        return sorted(vacancies_info, key=sort_key, reverse=reversed)
 
     @staticmethod
     def get_normalized_date(input):
@@ -509,23 +995,45 @@ class InputConnect:
 
     def prepare_vacancies_info(self, vacancies_info):
         """
-        Обрабатывает поданный на вход список вакансий: фильтрует и сортирует по поданным на вход критериям фильтрации и сортировки, преобразует дату
-        """
-        filtered_vacancies = InputConnect.get_filtered_vacancies(vacancies_info, self.parsed_input["Параметр фильтрации"])
-        sorted_vacancies = InputConnect.get_sorted_vacancies(filtered_vacancies, self.parsed_input["Параметр сортировки"], self.parsed_input["Порядок сортировки"])
-        normalized_date_sorted_vacancies = InputConnect.get_date_normalized_vacancies(sorted_vacancies)
-        return normalized_date_sorted_vacancies
+        Обрабатывает поданные на вход вакансии: фильтрует и сортирует по поданным на вход критериям фильтрации
+        и сортировки, отбирает попадающие в диапазон вывода и только их форматирует для печати.
+        Если сортировка не требуется, вакансии обрабатываются потоком и в памяти хранится только диапазон вывода.
+        Args:
+            vacancies_info (iterable): Вакансии-объекты VacancyRecord, которые нужно обработать
+        Returns:
+            list: Отформатированные вакансии из диапазона вывода
+        """
+        start, end = self.get_vacancies_range_bounds()
+        filtered_vacancies = InputConnect.get_filtered_vacancies_stream(vacancies_info, self.parsed_input["Параметр фильтрации"])
+        if len(self.parsed_input["Параметр сортировки"]) > 0:
+            limit = end if end is not None and end >= 0 else None
+            filtered_vacancies = InputConnect.get_sorted_vacancies(filtered_vacancies, self.parsed_input["Параметр сортировки"], self.parsed_input["Порядок сортировки"], limit)
+        if start < 0 or (end is not None and end < 0):
+            range_vacancies = list(filtered_vacancies)[start:end]
+        else:
+            range_vacancies = itertools.islice(filtered_vacancies, start, end)
+        return InputConnect.get_date_normalized_vacancies(InputConnect.get_formatted_vacancies(range_vacancies))
 
+    @staticmethod
+    def get_formatted_vacancies(vacancies_info):
+        """
+        Преобразует вакансии-объекты VacancyRecord в словари с отформатированными для вывода данными
+        Args:
+            vacancies_info (iterable): Вакансии-объекты VacancyRecord
+        Returns:
+            list: Список отформатированных вакансий
+        """
+        return [DataSet.formatter(vacancy_info.to_row()) for vacancy_info in vacancies_info]
 
-    def get_filled_table(self, vacancies_info):
+    def get_filled_table(self, vacancies_info, first_number=1):
         """
         Заполняет таблицу, представленную объектом PrettyTable, данными, поданными на вход.
         Args:
             vacancies_info (list): Список вакансий, которыми будет заполнена таблица.
+            first_number (int): Номер, с которого начинается нумерация строк таблицы
         Returns:
             PrettyTable: таблица, заполненная данными.
         """
-        vacancies_info = self.prepare_vacancies_info(vacancies_info)
         table = PrettyTable(align="l", hrules=1)
         field_names = []
         field_names.append("№")
@@ -534,24 +1042,20 @@ class InputConnect:
             field_names.append(element)
         table.field_names = field_names
         for i in range(len(vacancies_info)):
-            table.add_row([i + 1] + [InputConnect.make_string_length_limit(x) for x in vacancies_info[i].values()])
+            table.add_row([first_number + i] + [InputConnect.make_string_length_limit(x) for x in vacancies_info[i].values()])
         return table
 
     def print_table(self, vacancies_info):
         """
         Печатает в консоль таблицу, которая будет заполненая поданными на вход данными
         Args:
-            vacancies_info (list): Данные, которыми нужно заполнить таблицу для печати
+            vacancies_info (iterable): Данные, которыми нужно заполнить таблицу для печати
         Returns:
             None
         """
-        table = self.get_filled_table(vacancies_info)
-        vacancies_range = self.parsed_input["Диапазон вывода"]
-        vacancies_count = len(vacancies_info)
-        to_print_columns = self.parsed_input["Требуемые столбцы"]
-        print(table.get_string(start=0 if len(vacancies_range) == 1 else vacancies_range[0],
-                               end=vacancies_range[1] if None not in vacancies_range else vacancies_count,
-                               fields=["№"] + to_print_columns))
+        start, end = self.get_vacancies_range_bounds()
+        table = self.get_filled_table(self.prepare_vacancies_info(vacancies_info), first_number=start + 1)
+        print(table.get_string(fields=["№"] + self.parsed_input["Требуемые столбцы"]))
 
 
 class FileHandler:
@@ -573,6 +1077,18 @@ class FileHandler:
         ]
         return [input(f"{rows[i]}: ") for i in range(len(rows))]
 
+    @staticmethod
+    def get_job_names(raw_job_names):
+        """
+        Разбирает введенный пользователем список профессий
+        Args:
+            raw_job_names (str): Названия профессий через запятую
+        Returns:
+            list: Названия профессий без повторов в порядке ввода; если названий нет, введенная строка целиком
+        """
+        job_names = list(dict.fromkeys(job_name.strip() for job_name in raw_job_names.split(",") if job_name.strip()))
+        return job_names if len(job_names) > 0 else [raw_job_names]
+
     @staticmethod
     def csv_reader(file_name):
         """
@@ -582,9 +1098,133 @@ class FileHandler:
         Returns:
             list: Список обьектов-вакансий, полученных при обработке CSV-файла
         """
-        reader = csv.reader(open(file_name, encoding="utf_8_sig"))
-        data = [Vacancy(row) for row in list(filter(lambda x: "" not in x, reader))[1:]]
-        return data
+        return list(FileHandler.csv_stream(file_name))
+
+    @staticmethod
+    def get_file_hash(file_name):
+        """
+        Считает хеш содержимого файла, читая его блоками
+        Args:
+            file_name (str): имя файла
+        Returns:
+            str: Хеш содержимого файла
+        """
+        file_hash = hashlib.sha1()
+        with open(file_name, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def csv_cached_table(file_name, cache_directory=".vacancies_cache"):
+        """
+        Возвращает колоночную таблицу вакансий CSV-файла, используя кеш на диске.
+        Кеш привязан к пути файла; он считается актуальным, если совпадают время изменения и размер файла,
+        а при их несовпадении - хеш содержимого. Устаревший кеш перестраивается.
+        Args:
+            file_name (str): имя CSV-файла
+            cache_directory (str): папка для хранения кеша
+        Returns:
+            VacancyTable: Таблица вакансий
+        """
+        file_path = os.path.abspath(file_name)
+        table_directory = os.path.join(cache_directory, hashlib.sha1(file_path.encode("utf_8")).hexdigest())
+        meta_file_name = os.path.join(table_directory, "meta.json")
+        file_stat = os.stat(file_path)
+        meta = {"path": file_path, "mtime_ns": file_stat.st_mtime_ns, "size": file_stat.st_size,
+                "version": VacancyTable.cache_version}
+        if os.path.exists(meta_file_name):
+            with open(meta_file_name, encoding="utf_8") as file:
+                cached_meta = json.load(file)
+            if cached_meta.get("version") == meta["version"] and cached_meta["size"] == meta["size"]:
+                if cached_meta["mtime_ns"] == meta["mtime_ns"]:
+                    return VacancyTable.load(table_directory)
+                meta["hash"] = FileHandler.get_file_hash(file_path)
+                if cached_meta.get("hash") == meta["hash"]:
+                    with open(meta_file_name, "w", encoding="utf_8") as file:
+                        json.dump(meta, file)
+                    return VacancyTable.load(table_directory)
+        if file_stat.st_size >= parallel_parsing_min_file_size:
+            table = FileHandler.csv_parallel_table(file_name)
+        else:
+            table = FileHandler.csv_table(file_name)
+        meta["hash"] = meta.get("hash") or FileHandler.get_file_hash(file_path)
+        if os.path.exists(meta_file_name):
+            os.remove(meta_file_name)
+        table.save(table_directory)
+        with open(meta_file_name, "w", encoding="utf_8") as file:
+            json.dump(meta, file)
+        return table
+
+    @staticmethod
+    def parse_csv_chunk_table(file_name, start, end):
+        """
+        Обрабатывает вакансии из диапазона байтов CSV-файла в колоночную таблицу. Выполняется в отдельном процессе.
+        Args:
+            file_name (str): имя CSV-файла
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+        Returns:
+            VacancyTable: Таблица вакансий из диапазона
+        """
+        table = VacancyTable()
+        rows = (row for row in DataSet.read_csv_chunk(file_name, start, end) if "" not in row)
+        for batch in iter(lambda: list(itertools.islice(rows, table_rows_batch_size)), []):
+            table.append_rows(batch)
+        return table
+
+    @staticmethod
+    def csv_parallel_table(file_name, workers=None):
+        """
+        Обрабатывает данные из CSV-файла в колоночную таблицу, разбирая части файла в пуле процессов
+        Args:
+            file_name (str): имя CSV-файла
+            workers (int or None): Количество процессов (None - по числу ядер)
+        Returns:
+            VacancyTable: Таблица вакансий, полученная при обработке CSV-файла
+        """
+        workers = workers or os.cpu_count() or 1
+        table = VacancyTable()
+        chunks = DataSet.get_csv_chunks(file_name, workers * 4)[1]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_table in executor.map(FileHandler.parse_csv_chunk_table, itertools.repeat(file_name),
+                                            [chunk[0] for chunk in chunks], [chunk[1] for chunk in chunks]):
+                table.extend(chunk_table)
+        return table
+
+    @staticmethod
+    def csv_table(file_name):
+        """
+        Обрабатывает данные из CSV-файла в колоночную таблицу, не создавая объекта на каждую вакансию
+        Args:
+            file_name (str): имя CSV-файла
+        Returns:
+            VacancyTable: Таблица вакансий, полученная при обработке CSV-файла
+        """
+        table = VacancyTable()
+        with open(file_name, encoding="utf_8_sig") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            rows = (row for row in reader if "" not in row)
+            for batch in iter(lambda: list(itertools.islice(rows, table_rows_batch_size)), []):
+                table.append_rows(batch)
+        return table
+
+    @staticmethod
+    def csv_stream(file_name):
+        """
+        Лениво обрабатывает данные из CSV-файла, создавая вакансии-объекты по одной за раз
+        Args:
+            file_name (str): имя CSV-файла
+        Returns:
+            generator: Генератор обьектов-вакансий
+        """
+        with open(file_name, encoding="utf_8_sig") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                if "" not in row:
+                    yield Vacancy(row)
 
 
 class Vacancy:
@@ -592,39 +1232,273 @@ class Vacancy:
     Класс для хранения данных об отдельной вакансии
 
     Attributes:
-        __currentcies_exchanges (dict): Словарь с курсами валют, соответствующих разным странам
         name (str): Название вакансии
         salary (int): Средняя зарплата вакансии
         city (str): Город вакансии
         year (int): Год публикации вакансии
 
     """
+    __slots__ = ("name", "salary", "city", "year")
+
     def __init__(self, vacancy_info):
         """
         Инициализирует внутреннее состояние обьекта в соответствии с переданными данными
         Args:
             vacancy_info (list): список с данными о вакансии
         """
-        self.__currencies_exchanges = {
-            "AZN": 35.68,
-            "BYR": 23.91,
-            "EUR": 59.90,
-            "GEL": 21.74,
-            "KGS": 0.76,
-            "KZT": 0.13,
-            "RUR": 1,
-            "UAH": 1.64,
-            "USD": 60.66,
-            "UZS": 0.0055
-        }
         if len(vacancy_info) > 6:
             vacancy_info = [vacancy_info[0], vacancy_info[6], vacancy_info[7], vacancy_info[9], vacancy_info[10],
                             vacancy_info[11]]
         self.name = vacancy_info[0]
-        self.salary = int(0.5 * self.__currencies_exchanges[vacancy_info[3]] * (
-                float(vacancy_info[1]) + float(vacancy_info[2])))
+        self.salary = Vacancy.get_salary(vacancy_info[1], vacancy_info[2], vacancy_info[3])
         self.city = vacancy_info[4]
-        self.year = int(datetime.strptime(vacancy_info[5], '%Y-%m-%dT%H:%M:%S%z').strftime('%Y'))
+        self.year = PublishedAt.get_year(vacancy_info[5])
+
+    @staticmethod
+    def get_salary(salary_from, salary_to, salary_currency):
+        """
+        Возвращает среднюю зарплату вакансии в рублях так же, как она считается при создании объекта
+        Args:
+            salary_from (str or float): Нижняя граница оклада
+            salary_to (str or float): Верхняя граница оклада
+            salary_currency (str): Идентификатор валюты оклада
+        Returns:
+            int: Средняя зарплата вакансии в рублях
+        """
+        return int(0.5 * fixed_exchange_rates.get_rate(salary_currency) * (float(salary_from) + float(salary_to)))
+
+
+class VacancyTable:
+    """
+    Класс для колоночного хранения данных о вакансиях: вместо объекта на каждую вакансию хранятся
+    компактные массивы, а названия и города закодированы номерами в словарях уникальных значений
+
+    Attributes:
+        names (list): Уникальные названия вакансий в порядке первого появления
+        cities (list): Уникальные города в порядке первого появления
+        name_codes (np.ndarray): Номера названий вакансий в списке names
+        salaries (np.ndarray): Средние зарплаты вакансий в рублях
+        city_codes (np.ndarray): Номера городов вакансий в списке cities
+        years (np.ndarray): Годы публикации вакансий
+    """
+    columns_names = ["name_codes", "salaries", "city_codes", "years"]
+    columns_types = ["i", "q", "i", "h"]
+    cache_version = 2
+
+    def __init__(self):
+        """
+        Инициализирует пустую таблицу вакансий
+        """
+        self.names = []
+        self.cities = []
+        self.__names_codes = {}
+        self.__cities_codes = {}
+        self.__column_arrays = [array(column_type) for column_type in VacancyTable.columns_types]
+        self.__columns = None
+        self.__names_index = None
+
+    def __len__(self):
+        """
+        Возвращает количество вакансий в таблице
+        """
+        if self.__column_arrays is None:
+            return len(self.__columns[1])
+        return len(self.__column_arrays[1])
+
+    @staticmethod
+    def get_code(value, values, values_codes):
+        """
+        Возвращает номер значения в словаре уникальных значений, добавляя его туда при необходимости
+        Args:
+            value (str): Значение, которое нужно закодировать
+            values (list): Уникальные значения в порядке первого появления
+            values_codes (dict): Номера уникальных значений
+        Returns:
+            int: Номер значения
+        """
+        code = values_codes.get(value)
+        if code is None:
+            code = len(values)
+            values_codes[value] = code
+            values.append(value)
+        return code
+
+    def append(self, vacancy_info):
+        """
+        Добавляет в таблицу вакансию, заданную строкой CSV-файла
+        Args:
+            vacancy_info (list): список с данными о вакансии в том же виде, что принимает Vacancy
+        """
+        if len(vacancy_info) > 6:
+            vacancy_info = [vacancy_info[0], vacancy_info[6], vacancy_info[7], vacancy_info[9], vacancy_info[10],
+                            vacancy_info[11]]
+        self.append_values(vacancy_info[0],
+                           Vacancy.get_salary(vacancy_info[1], vacancy_info[2], vacancy_info[3]),
+                           vacancy_info[4],
+                           PublishedAt.get_year(vacancy_info[5]))
+
+    def append_rows(self, rows):
+        """
+        Добавляет в таблицу вакансии, заданные строками CSV-файла. Годы публикации разбираются сразу для всех строк
+        Args:
+            rows (list): строки с данными о вакансиях в том же виде, что принимает append
+        """
+        rows = [row if len(row) <= 6 else [row[0], row[6], row[7], row[9], row[10], row[11]] for row in rows]
+        if not rows:
+            return
+        salaries = [Vacancy.get_salary(row[1], row[2], row[3]) for row in rows]
+        years = PublishedAt.get_years([row[5] for row in rows]).tolist()
+        if self.__column_arrays is None:
+            self.__column_arrays = [array(column_type, column.tolist())
+                                    for column_type, column in zip(VacancyTable.columns_types, self.__columns)]
+        name_column, salary_column, city_column, year_column = self.__column_arrays
+        name_column.extend(VacancyTable.get_code(row[0], self.names, self.__names_codes) for row in rows)
+        salary_column.extend(salaries)
+        city_column.extend(VacancyTable.get_code(row[4], self.cities, self.__cities_codes) for row in rows)
+        year_column.extend(years)
+        self.__columns = None
+
+    def append_values(self, name, salary, city, year):
+        """
+        Добавляет в таблицу вакансию, заданную уже обработанными значениями
+        Args:
+            name (str): Название вакансии
+            salary (int): Средняя зарплата вакансии в рублях
+            city (str): Город вакансии
+            year (int): Год публикации вакансии
+        """
+        if self.__column_arrays is None:
+            self.__column_arrays = [array(column_type, column.tolist())
+                                    for column_type, column in zip(VacancyTable.columns_types, self.__columns)]
+        name_column, salary_column, city_column, year_column = self.__column_arrays
+        name_column.append(VacancyTable.get_code(name, self.names, self.__names_codes))
+        salary_column.append(salary)
+        city_column.append(VacancyTable.get_code(city, self.cities, self.__cities_codes))
+        year_column.append(year)
+        self.__columns = None
+
+    def extend(self, other):
+        """
+        Добавляет в конец таблицы все вакансии другой таблицы, перекодируя названия и города
+        Args:
+            other (VacancyTable): Таблица, вакансии которой нужно добавить
+        """
+        if self.__column_arrays is None:
+            self.__column_arrays = [array(column_type, column.tolist())
+                                    for column_type, column in zip(VacancyTable.columns_types, self.__columns)]
+        names_codes = np.array([VacancyTable.get_code(name, self.names, self.__names_codes) for name in other.names], dtype=np.int32)
+        cities_codes = np.array([VacancyTable.get_code(city, self.cities, self.__cities_codes) for city in other.cities], dtype=np.int32)
+        name_codes, salaries, city_codes, years = other.get_columns()
+        other_columns = [names_codes[name_codes] if len(name_codes) else name_codes, salaries,
+                         cities_codes[city_codes] if len(city_codes) else city_codes, years]
+        for column_array, column in zip(self.__column_arrays, other_columns):
+            column_array.frombytes(np.ascontiguousarray(column, dtype=column_array.typecode).tobytes())
+        self.__columns = None
+
+    def get_columns(self):
+        """
+        Возвращает колонки таблицы в виде массивов NumPy
+        Returns:
+            tuple: Колонки номеров названий, зарплат, номеров городов и годов
+        """
+        if self.__columns is None:
+            self.__columns = tuple(np.array(column, dtype=column.typecode) for column in self.__column_arrays)
+        return self.__columns
+
+    def save(self, directory):
+        """
+        Сохраняет таблицу в папку в виде файлов .npy (по одному на колонку), JSON-файла со словарями значений
+        и файла с индексом названий
+        Args:
+            directory (str): Папка, в которую нужно сохранить таблицу
+        """
+        os.makedirs(directory, exist_ok=True)
+        for column_name, column in zip(VacancyTable.columns_names, self.get_columns()):
+            np.save(os.path.join(directory, f"{column_name}.npy"), column)
+        with open(os.path.join(directory, "dictionaries.json"), "w", encoding="utf_8") as file:
+            json.dump({"names": self.names, "cities": self.cities}, file, ensure_ascii=False)
+        self.get_names_index().save(os.path.join(directory, "names_index.npz"))
+
+    @staticmethod
+    def load(directory):
+        """
+        Загружает таблицу, сохраненную методом save. Колонки отображаются в память, а не считываются целиком.
+        Args:
+            directory (str): Папка с сохраненной таблицей
+        Returns:
+            VacancyTable: Загруженная таблица
+        """
+        table = VacancyTable()
+        with open(os.path.join(directory, "dictionaries.json"), encoding="utf_8") as file:
+            dictionaries = json.load(file)
+        for value in dictionaries["names"]:
+            VacancyTable.get_code(value, table.names, table.__names_codes)
+        for value in dictionaries["cities"]:
+            VacancyTable.get_code(value, table.cities, table.__cities_codes)
+        table.__columns = tuple(np.load(os.path.join(directory, f"{column_name}.npy"), mmap_mode="r")
+                                for column_name in VacancyTable.columns_names)
+        table.__column_arrays = None
+        if os.path.exists(os.path.join(directory, "names_index.npz")):
+            table.__names_index = NameIndex.load(os.path.join(directory, "names_index.npz"), table.names)
+        return table
+
+    @property
+    def name_codes(self):
+        return self.get_columns()[0]
+
+    @property
+    def salaries(self):
+        return self.get_columns()[1]
+
+    @property
+    def city_codes(self):
+        return self.get_columns()[2]
+
+    @property
+    def years(self):
+        return self.get_columns()[3]
+
+    def get_names_index(self):
+        """
+        Возвращает триграммный индекс по уникальным названиям, строя его при первом обращении
+        Returns:
+            NameIndex: Индекс названий, дополняемый при добавлении в таблицу новых названий
+        """
+        if self.__names_index is None:
+            self.__names_index = NameIndex(self.names)
+        return self.__names_index
+
+    def get_name_mask(self, name):
+        """
+        Возвращает маску вакансий, в названии которых встречается поданная на вход строка.
+        Проверка выполняется один раз для каждого уникального названия, а не для каждой вакансии.
+        Если у таблицы уже есть индекс названий (построен ранее или загружен из кеша), проверяются
+        только названия, найденные по индексу.
+        Args:
+            name (str): Искомая подстрока названия
+        Returns:
+            np.ndarray: Булев массив, True для подходящих вакансий
+        """
+        if self.__names_index is not None:
+            matched_names = self.__names_index.get_mask(name)
+        else:
+            matched_names = np.fromiter((name in vacancy_name for vacancy_name in self.names), dtype=bool,
+                                        count=len(self.names))
+        return matched_names[self.name_codes]
+
+    @staticmethod
+    def from_vacancies(vacancies_info):
+        """
+        Создает таблицу из последовательности вакансий-объектов
+        Args:
+            vacancies_info (iterable): Вакансии-объекты Vacancy
+        Returns:
+            VacancyTable: Таблица с данными вакансий
+        """
+        table = VacancyTable()
+        for vacancy_info in vacancies_info:
+            table.append_values(vacancy_info.name, vacancy_info.salary, vacancy_info.city, vacancy_info.year)
+        return table
 
 class Statistics:
     """
@@ -661,66 +1535,65 @@ class Statistics:
         """
         return {x: y for x in keys for y in [0]}
 
+    @staticmethod
+    def get_grouped_sums(codes, values, groups_count):
+        """
+        Считает за один проход сумму значений и количество элементов для каждой группы
+        Args:
+            codes (np.ndarray): Номера групп элементов
+            values (np.ndarray): Значения элементов
+            groups_count (int): Количество групп
+        Returns:
+            np.ndarray: Суммы значений по группам
+            np.ndarray: Количества элементов по группам
+        """
+        sums = np.bincount(codes, weights=values, minlength=groups_count).astype(np.int64)
+        counts = np.bincount(codes, minlength=groups_count)
+        return sums, counts
+
+    @staticmethod
+    def get_top_indexes(values, count):
+        """
+        Возвращает индексы наибольших значений в порядке убывания.
+        Равные значения упорядочиваются по индексу, как при устойчивой сортировке списка.
+        Args:
+            values (np.ndarray): Значения
+            count (int): Количество индексов, которые нужно вернуть
+        Returns:
+            np.ndarray: Индексы наибольших значений
+        """
+        if len(values) > count:
+            kth_value = values[np.argpartition(-values, count - 1)[count - 1]]
+            indexes = np.flatnonzero(values >= kth_value)
+        else:
+            indexes = np.arange(len(values))
+        return indexes[np.lexsort((indexes, -values[indexes]))][:count]
+
     def prepare(self, vacancies_info, name):
         """
-        Подготавливает статистические данные из списка информации о вакансиях
+        Подготавливает статистические данные из информации о вакансиях
+
+        Args:
+            vacancies_info (VacancyTable or list): Таблица вакансий или список вакансий-объектов
+            name (str): Название профессии
         """
-        years = set()
-        cities = list()
-        for vacancy_info in vacancies_info:
-            years.add(vacancy_info.year)
-            if vacancy_info.city not in cities:
-                cities.append(vacancy_info.city)
-        years = sorted(years)
-        years_salaries = self.get_empty_dict_with_keys(years)
-        job_years_salaries = self.get_empty_dict_with_keys(years)
-        years_vacancies_counts = self.get_empty_dict_with_keys(years)
-        job_years_vacancies = self.get_empty_dict_with_keys(years)
-        cities_salaries = self.get_empty_dict_with_keys(cities)
-        cities_vacancies = self.get_empty_dict_with_keys(cities)
+        accumulator = StatisticsAccumulator(name)
+        accumulator.update(vacancies_info)
+        accumulator.finalize(self)
 
-        for vacancy_info in vacancies_info:
-            years_salaries[vacancy_info.year] += vacancy_info.salary
-            years_vacancies_counts[vacancy_info.year] += 1
-            cities_salaries[vacancy_info.city] += vacancy_info.salary
-            cities_vacancies[vacancy_info.city] += 1
-            if name in vacancy_info.name:
-                job_years_vacancies[vacancy_info.year] += 1
-                job_years_salaries[vacancy_info.year] += vacancy_info.salary
-
-        for year in years:
-            if years_vacancies_counts[year] > 0:
-                years_salaries[year] = years_salaries[year] // years_vacancies_counts[year]
-            if job_years_vacancies[year] > 0:
-                job_years_salaries[year] = job_years_salaries[year] // job_years_vacancies[year]
-        for city in cities:
-            cities_salaries[city] = cities_salaries[city] // cities_vacancies[city]
-
-        vacancies_count = len(vacancies_info)
-
-        proper_cities_salaries = dict()
-        for city_salary in cities_salaries.items():
-            if math.floor(100 * cities_vacancies[city_salary[0]] / vacancies_count) >= 1:
-                proper_cities_salaries.update({city_salary[0]: city_salary[1]})
-
-        cities_vacancies_ratios = dict()
-        for city_vacancy in cities_vacancies.items():
-            if math.floor(100 * city_vacancy[1] / vacancies_count) >= 1:
-                cities_vacancies_ratios.update(
-                    {city_vacancy[0]: round(city_vacancy[1] / vacancies_count, 4)})
+    @staticmethod
+    def prepare_professions(vacancies_info, names):
+        """
+        Подготавливает статистические данные сразу для нескольких профессий за один проход по вакансиям
 
-        self.years_salaries = years_salaries
-        self.years_vacancies_counts = years_vacancies_counts
-        self.job_years_salaries = job_years_salaries
-        self.job_years_vacancies = job_years_vacancies
-        slice_end = 10 if len(proper_cities_salaries.items()) > 10 else len(proper_cities_salaries.items())
-        self.cities_salaries = dict(
-            sorted(proper_cities_salaries.items(), key=lambda x: x[1], reverse=True)[:slice_end])
-        slice_end = 10 if len(cities_vacancies_ratios.items()) > 10 else len(cities_vacancies_ratios.items())
-        self.cities_vacancies_ratios = dict(
-            sorted(cities_vacancies_ratios.items(), key=lambda x: x[1], reverse=True)[:slice_end])
-        if len(cities_vacancies_ratios.items()) > 10:
-            self.cities_vacancies_ratios.update({"Другие": round(1 - sum(self.cities_vacancies_ratios.values()), 4)})
+        Args:
+            vacancies_info (VacancyTable or list): Таблица вакансий или список вакансий-объектов
+            names (list): Названия профессий
+
+        Returns:
+            dict: Объекты Statistics, ключи - названия профессий
+        """
+        return StatisticsAccumulator(names).update(vacancies_info).finalize_all()
 
     def print(self):
         """
@@ -752,6 +1625,208 @@ class Statistics:
                self.cities_salaries, \
                self.cities_vacancies_ratios
 
+class StatisticsAccumulator:
+    """
+    Класс для накопления промежуточных статистических данных: сумм зарплат и количеств вакансий по годам,
+    по годам для выбранных профессий и по городам. Накопители можно пополнять по частям и объединять,
+    поэтому статистику можно считать потоком, параллельно или по нескольким файлам.
+    Общие для всех профессий данные считаются один раз, сколько бы профессий ни было задано.
+
+    Attributes:
+        names (list): Названия профессий
+        name (str): Название первой профессии
+        matcher (KeywordMatcher or None): Автомат для разметки названий профессиями, None - если профессия одна
+        vacancies_count (int): Количество учтенных вакансий
+        years_salaries_sums (dict): Суммы зарплат по годам
+        years_vacancies_counts (dict): Количества вакансий по годам
+        jobs_years_salaries_sums (dict): Суммы зарплат по годам для каждой профессии
+        jobs_years_vacancies_counts (dict): Количества вакансий по годам для каждой профессии
+        cities_salaries_sums (dict): Суммы зарплат по городам в порядке первого появления
+        cities_vacancies_counts (dict): Количества вакансий по городам в порядке первого появления
+    """
+    def __init__(self, name):
+        """
+        Инициализирует пустой накопитель
+        Args:
+            name (str or list): Название профессии или список названий профессий
+        """
+        self.names = [name] if isinstance(name, str) else list(dict.fromkeys(name))
+        self.name = self.names[0]
+        self.matcher = KeywordMatcher(self.names) if len(self.names) > 1 else None
+        self.vacancies_count = 0
+        self.years_salaries_sums = {}
+        self.years_vacancies_counts = {}
+        self.jobs_years_salaries_sums = {job_name: {} for job_name in self.names}
+        self.jobs_years_vacancies_counts = {job_name: {} for job_name in self.names}
+        self.cities_salaries_sums = {}
+        self.cities_vacancies_counts = {}
+
+    @property
+    def job_years_salaries_sums(self):
+        """
+        Суммы зарплат по годам для первой профессии
+        """
+        return self.jobs_years_salaries_sums[self.name]
+
+    @property
+    def job_years_vacancies_counts(self):
+        """
+        Количества вакансий по годам для первой профессии
+        """
+        return self.jobs_years_vacancies_counts[self.name]
+
+    @staticmethod
+    def add_to_dict(target, keys, values):
+        """
+        Прибавляет значения к словарю по ключам, добавляя отсутствующие ключи в конец
+        Args:
+            target (dict): Словарь, который нужно пополнить
+            keys (iterable): Ключи
+            values (iterable): Значения
+        """
+        for key, value in zip(keys, values):
+            target[key] = target.get(key, 0) + value
+
+    def update(self, batch):
+        """
+        Учитывает в накопителе очередную порцию вакансий
+        Args:
+            batch (VacancyTable or list): Таблица вакансий или список вакансий-объектов
+        Returns:
+            StatisticsAccumulator: Этот же накопитель
+        """
+        if not isinstance(batch, VacancyTable):
+            batch = VacancyTable.from_vacancies(batch)
+        if len(batch) == 0:
+            return self
+        self.vacancies_count += len(batch)
+        salaries = batch.salaries
+        first_year = int(batch.years.min())
+        years_offsets = batch.years - first_year
+        years_range = int(years_offsets.max()) + 1
+
+        years_sums, years_counts = Statistics.get_grouped_sums(years_offsets, salaries, years_range)
+        years_indexes = np.flatnonzero(years_counts)
+        years = (years_indexes + first_year).tolist()
+        StatisticsAccumulator.add_to_dict(self.years_salaries_sums, years, years_sums[years_indexes].tolist())
+        StatisticsAccumulator.add_to_dict(self.years_vacancies_counts, years, years_counts[years_indexes].tolist())
+
+        # Несколько профессий размечаются автоматом Ахо-Корасик за один проход по уникальным названиям
+        if self.matcher is None:
+            job_mask = batch.get_name_mask(self.name)
+            jobs_sums, jobs_counts = Statistics.get_grouped_sums(years_offsets[job_mask], salaries[job_mask], years_range)
+            jobs_sums, jobs_counts = jobs_sums[np.newaxis], jobs_counts[np.newaxis]
+        else:
+            jobs_sums, jobs_counts = self.matcher.get_grouped_sums(batch.names, batch.name_codes, salaries,
+                                                                   years_offsets, years_range)
+            jobs_sums = jobs_sums.astype(np.int64)
+        for job_name, job_sums, job_counts in zip(self.names, jobs_sums, jobs_counts):
+            StatisticsAccumulator.add_to_dict(self.jobs_years_salaries_sums[job_name], years,
+                                              job_sums[years_indexes].tolist())
+            StatisticsAccumulator.add_to_dict(self.jobs_years_vacancies_counts[job_name], years,
+                                              job_counts[years_indexes].tolist())
+
+        cities_sums, cities_counts = Statistics.get_grouped_sums(batch.city_codes, salaries, len(batch.cities))
+        cities_indexes = np.flatnonzero(cities_counts)
+        cities = [batch.cities[i] for i in cities_indexes.tolist()]
+        StatisticsAccumulator.add_to_dict(self.cities_salaries_sums, cities, cities_sums[cities_indexes].tolist())
+        StatisticsAccumulator.add_to_dict(self.cities_vacancies_counts, cities, cities_counts[cities_indexes].tolist())
+        return self
+
+    def merge(self, other):
+        """
+        Добавляет к накопителю данные другого накопителя, посчитанные по следующей части вакансий
+        Args:
+            other (StatisticsAccumulator): Накопитель с теми же профессиями, данные которого нужно добавить
+        Returns:
+            StatisticsAccumulator: Этот же накопитель
+        """
+        self.vacancies_count += other.vacancies_count
+        for name in ["years_salaries_sums", "years_vacancies_counts", "cities_salaries_sums", "cities_vacancies_counts"]:
+            other_dict = getattr(other, name)
+            StatisticsAccumulator.add_to_dict(getattr(self, name), other_dict.keys(), other_dict.values())
+        for name in ["jobs_years_salaries_sums", "jobs_years_vacancies_counts"]:
+            for job_name, other_dict in getattr(other, name).items():
+                StatisticsAccumulator.add_to_dict(getattr(self, name)[job_name], other_dict.keys(), other_dict.values())
+        return self
+
+    def finalize(self, statistics=None, name=None):
+        """
+        Вычисляет итоговые статистические данные по накопленным суммам и количествам
+        Args:
+            statistics (Statistics or None): Объект, который нужно заполнить (None - создать новый)
+            name (str or None): Профессия, для которой нужна статистика (None - первая профессия)
+        Returns:
+            Statistics: Заполненный статистическими данными объект
+        """
+        statistics = statistics or Statistics()
+        self.__finalize_common(statistics)
+        self.__finalize_job(statistics, name or self.name)
+        return statistics
+
+    def finalize_all(self):
+        """
+        Вычисляет итоговые статистические данные для каждой профессии, общие данные считаются один раз
+        Returns:
+            dict: Заполненные объекты Statistics, ключи - названия профессий
+        """
+        common_statistics = self.__finalize_common(Statistics())
+        jobs_statistics = {}
+        for job_name in self.names:
+            statistics = Statistics()
+            statistics.__dict__.update(common_statistics.__dict__)
+            jobs_statistics[job_name] = self.__finalize_job(statistics, job_name)
+        return jobs_statistics
+
+    def __finalize_job(self, statistics, name):
+        """
+        Заполняет статистические данные по годам для одной профессии
+        Args:
+            statistics (Statistics): Объект, который нужно заполнить
+            name (str): Название профессии
+        Returns:
+            Statistics: Заполненный объект
+        """
+        years = sorted(self.years_vacancies_counts)
+        job_years_salaries_sums = self.jobs_years_salaries_sums[name]
+        job_years_vacancies_counts = self.jobs_years_vacancies_counts[name]
+        statistics.job_years_salaries = {
+            year: job_years_salaries_sums[year] // job_years_vacancies_counts[year]
+            if job_years_vacancies_counts[year] > 0 else job_years_salaries_sums[year] for year in years}
+        statistics.job_years_vacancies = {year: job_years_vacancies_counts[year] for year in years}
+        return statistics
+
+    def __finalize_common(self, statistics):
+        """
+        Заполняет статистические данные, не зависящие от профессии
+        Args:
+            statistics (Statistics): Объект, который нужно заполнить
+        Returns:
+            Statistics: Заполненный объект
+        """
+        years = sorted(self.years_vacancies_counts)
+        statistics.years_salaries = {year: self.years_salaries_sums[year] // self.years_vacancies_counts[year] for year in years}
+        statistics.years_vacancies_counts = {year: self.years_vacancies_counts[year] for year in years}
+
+        cities = list(self.cities_vacancies_counts)
+        cities_counts = np.array(list(self.cities_vacancies_counts.values()), dtype=np.int64)
+        cities_sums = np.array(list(self.cities_salaries_sums.values()), dtype=np.int64)
+        proper_cities_indexes = np.flatnonzero(100 * cities_counts >= self.vacancies_count)
+        proper_cities_salaries = cities_sums[proper_cities_indexes] // cities_counts[proper_cities_indexes]
+        proper_cities_ratios = np.array([round(count / self.vacancies_count, 4)
+                                         for count in cities_counts[proper_cities_indexes].tolist()])
+
+        top_indexes = Statistics.get_top_indexes(proper_cities_salaries, 10)
+        statistics.cities_salaries = dict(zip([cities[i] for i in proper_cities_indexes[top_indexes]],
+                                              proper_cities_salaries[top_indexes].tolist()))
+        top_indexes = Statistics.get_top_indexes(proper_cities_ratios, 10)
+        statistics.cities_vacancies_ratios = dict(zip([cities[i] for i in proper_cities_indexes[top_indexes]],
+                                                      proper_cities_ratios[top_indexes].tolist()))
+        if len(proper_cities_indexes) > 10:
+            statistics.cities_vacancies_ratios.update({"Другие": round(1 - sum(statistics.cities_vacancies_ratios.values()), 4)})
+        return statistics
+
+
 class Report:
     """
     Класс, отвечающий за отрисовку графиков и дальнейшее сохранение их в файл формата PNG.
@@ -792,9 +1867,11 @@ class Report:
         self.cities_salaries = cities_salaries
         self.cities_vacancies_ratios = cities_vacancies_ratios
 
-    def render_graph(self):
+    def render_graph(self, file_name="graph.png"):
         """
         Отрисовывает все 4 графика
+        Args:
+            file_name (str): Название PNG-файла, в который сохраняются графики
         """
         fig, ax = plt.subplots(2, 2)
         self.render_years_salaries_graph(ax[0, 0])
@@ -802,8 +1879,9 @@ class Report:
         self.render_cities_salaries_graph(ax[1, 0])
         self.render_cities_vacancies_ratios_graph(ax[1, 1])
         plt.tight_layout()
-        plt.savefig("graph.png")
+        plt.savefig(file_name)
         plt.show()
+        plt.close(fig)
 
     def render_years_salaries_graph(self, ax):
         ax.set_title("Уровень зарплат по годам")
@@ -869,18 +1947,29 @@ class Report:
 
 
 
-functionality_choice = input("Выберите интересующую функциональность (таблица с вакансиями - 1 / статистика по вакансиям - 2): ")
-if functionality_choice == "1":
-    input_connect = InputConnect()
-    dataset = DataSet(input_connect.parsed_input["Название файла"])
-    input_connect.print_table(dataset.vacancies_objects)
-elif functionality_choice == "2":
-    user_input = FileHandler.get_user_input()
-    file_name = user_input[0]
-    vacancy_name = user_input[1]
-    vacancies_info = FileHandler.csv_reader(file_name)
-    statistics = Statistics()
-    statistics.prepare(vacancies_info, vacancy_name)
-    statistics.print()
-    report = Report(vacancy_name, *statistics.get_prepared_statistics())
-    report.render_graph()
+if __name__ == "__main__":
+    functionality_choice = input("Выберите интересующую функциональность (таблица с вакансиями - 1 / статистика по вакансиям - 2): ")
+    if functionality_choice == "1":
+        input_connect = InputConnect()
+        file_name = input_connect.parsed_input["Название файла"]
+        parallel = len(input_connect.parsed_input["Параметр сортировки"]) > 0 and \
+            os.path.getsize(file_name) >= parallel_parsing_min_file_size
+        dataset = DataSet(file_name, lazy=True, parallel=parallel, criteria=input_connect.parsed_input["Параметр фильтрации"])
+        input_connect.print_table(dataset.vacancies_objects)
+    elif functionality_choice == "2":
+        user_input = FileHandler.get_user_input()
+        file_name = user_input[0]
+        vacancy_names = FileHandler.get_job_names(user_input[1])
+        vacancies_info = FileHandler.csv_cached_table(file_name)
+        if len(vacancy_names) == 1:
+            statistics = Statistics()
+            statistics.prepare(vacancies_info, vacancy_names[0])
+            statistics.print()
+            report = Report(vacancy_names[0], *statistics.get_prepared_statistics())
+            report.render_graph()
+        else:
+            for i, (vacancy_name, statistics) in enumerate(Statistics.prepare_professions(vacancies_info, vacancy_names).items()):
+                print(f"Профессия: {vacancy_name}")
+                statistics.print()
+                report = Report(vacancy_name, *statistics.get_prepared_statistics())
+                report.render_graph(f"graph_{i + 1}.png")
@@ -0,0 +1,115 @@
+from array import array
+import numpy as np
+
+
+class NameIndex:
+    """
+    Класс триграммного индекса по названиям вакансий: для каждой тройки подряд идущих символов хранится список
+    номеров названий, в которых она встречается. Поиск подстроки проверяет только названия из самого короткого
+    списка среди троек подстроки, а не все названия
+
+    Attributes:
+        ngram_size (int): Длина индексируемых подстрок
+        names (list): Индексируемые названия; индекс ссылается на этот же список и дополняется при его росте
+    """
+    ngram_size = 3
+
+    def __init__(self, names):
+        """
+        Строит индекс по списку названий
+        Args:
+            names (list): Названия вакансий, номера названий - их позиции в списке
+        """
+        self.names = names
+        self.__postings = {}
+        self.__indexed_count = 0
+        self.update()
+
+    @staticmethod
+    def get_ngrams(text):
+        """
+        Возвращает множество подстрок длины ngram_size, из которых состоит строка
+        Args:
+            text (str): Строка
+        Returns:
+            set: Подстроки строки длины ngram_size
+        """
+        return {text[i:i + NameIndex.ngram_size] for i in range(len(text) - NameIndex.ngram_size + 1)}
+
+    def update(self):
+        """
+        Добавляет в индекс названия, появившиеся в списке names после последнего обновления
+        """
+        postings = self.__postings
+        for code in range(self.__indexed_count, len(self.names)):
+            for ngram in NameIndex.get_ngrams(self.names[code]):
+                codes = postings.get(ngram)
+                if codes is None:
+                    codes = postings[ngram] = array("i")
+                codes.append(code)
+        self.__indexed_count = len(self.names)
+
+    def find(self, substring):
+        """
+        Возвращает номера названий, в которых встречается подстрока
+        Args:
+            substring (str): Искомая подстрока
+        Returns:
+            list: Номера подходящих названий по возрастанию
+        """
+        self.update()
+        ngrams = NameIndex.get_ngrams(substring)
+        if len(ngrams) == 0:
+            candidates = range(len(self.names))
+        else:
+            candidates = min((self.__postings.get(ngram, ()) for ngram in ngrams), key=len)
+        names = self.names
+        return [code for code in candidates if substring in names[code]]
+
+    def get_mask(self, substring):
+        """
+        Возвращает маску названий, в которых встречается подстрока
+        Args:
+            substring (str): Искомая подстрока
+        Returns:
+            np.ndarray: Булев массив длины len(names)
+        """
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[self.find(substring)] = True
+        return mask
+
+    def save(self, file_name):
+        """
+        Сохраняет индекс в файл .npz: подстроки, границы их списков и номера названий подряд
+        Args:
+            file_name (str): Название файла
+        """
+        self.update()
+        ngrams = sorted(self.__postings)
+        lengths = np.array([len(self.__postings[ngram]) for ngram in ngrams], dtype=np.int64)
+        codes = array("i")
+        for ngram in ngrams:
+            codes.extend(self.__postings[ngram])
+        np.savez(file_name, ngrams=np.array(ngrams, dtype=f"U{NameIndex.ngram_size}"),
+                 offsets=np.concatenate([[0], np.cumsum(lengths)]), codes=np.array(codes, dtype=np.int32),
+                 indexed_count=self.__indexed_count)
+
+    @staticmethod
+    def load(file_name, names):
+        """
+        Загружает индекс, сохраненный методом save
+        Args:
+            file_name (str): Название файла
+            names (list): Те же названия, по которым строился сохраненный индекс
+        Returns:
+            NameIndex: Загруженный индекс
+        """
+        index = NameIndex([])
+        with np.load(file_name) as data:
+            offsets = data["offsets"].tolist()
+            codes = data["codes"].tobytes()
+            for i, ngram in enumerate(data["ngrams"].tolist()):
+                index.__postings[ngram] = array("i", codes[4 * offsets[i]:4 * offsets[i + 1]])
+            index.__indexed_count = int(data["indexed_count"])
+        index.names = names
+        return index
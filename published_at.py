@@ -0,0 +1,87 @@
+from datetime import date
+import functools
+import numpy as np
+
+
+class PublishedAt:
+    """
+    Класс для разбора дат публикации вакансий фиксированного вида "ГГГГ-ММ-ДДTЧЧ:ММ:СС+ЧЧММ".
+    Поля берутся срезами строки без strptime, для целых столбцов - векторно по кодам символов
+
+    Attributes:
+        epoch_ordinal (int): Порядковый номер дня 01.01.1970, от которого отсчитываются секунды
+    """
+    epoch_ordinal = date(1970, 1, 1).toordinal()
+
+    @staticmethod
+    def get_year(published_at):
+        """
+        Возвращает год публикации
+        Args:
+            published_at (str): Дата публикации вакансии
+        Returns:
+            int: Год публикации
+        """
+        return int(published_at[0:4])
+
+    @staticmethod
+    def get_month(published_at):
+        """
+        Возвращает номер месяца по дате вида "ГГГГ-ММ..."
+        Args:
+            published_at (str): Дата публикации вакансии
+        Returns:
+            int: Номер месяца, считая от начала нашей эры
+        """
+        return int(published_at[0:4]) * 12 + int(published_at[5:7]) - 1
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
+    def get_timestamp(published_at):
+        """
+        Возвращает момент публикации в секундах. Результаты запоминаются, поэтому повторяющиеся даты
+        (например, при сортировке) разбираются один раз
+        Args:
+            published_at (str): Дата публикации вакансии
+        Returns:
+            int: Количество секунд, прошедших с 01.01.1970 до момента публикации (по UTC)
+        """
+        tz_sign = -1 if published_at[19] == "-" else 1
+        tz_offset = tz_sign * (int(published_at[20:22]) * 3600 + int(published_at[22:24]) * 60)
+        day = date(int(published_at[0:4]), int(published_at[5:7]), int(published_at[8:10])).toordinal()
+        return (day - PublishedAt.epoch_ordinal) * 86400 + int(published_at[11:13]) * 3600 + \
+            int(published_at[14:16]) * 60 + int(published_at[17:19]) - tz_offset
+
+    @staticmethod
+    def get_digits(published_at, length):
+        """
+        Возвращает коды первых length символов каждой даты, уменьшенные на код "0", без создания строк
+        Args:
+            published_at (iterable): Даты публикации вакансий
+            length (int): Количество символов, которые нужно разобрать
+        Returns:
+            np.ndarray: Массив размером (количество дат, length)
+        """
+        return np.asarray(published_at, dtype=f"U{length}").view(np.uint32).reshape(-1, length).astype(np.int64) - ord("0")
+
+    @staticmethod
+    def get_years(published_at):
+        """
+        Возвращает годы публикации для массива дат
+        Args:
+            published_at (iterable): Даты публикации вакансий
+        Returns:
+            np.ndarray: Годы публикации
+        """
+        return PublishedAt.get_digits(published_at, 4) @ np.array([1000, 100, 10, 1])
+
+    @staticmethod
+    def get_months(published_at):
+        """
+        Возвращает номера месяцев для массива дат вида "ГГГГ-ММ..."
+        Args:
+            published_at (iterable): Даты публикации вакансий
+        Returns:
+            np.ndarray: Номера месяцев, считая от начала нашей эры
+        """
+        return PublishedAt.get_digits(published_at, 7) @ np.array([12000, 1200, 120, 12, 0, 10, 1]) - 1
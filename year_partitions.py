@@ -0,0 +1,114 @@
+import csv
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class YearPartitions:
+    """
+    Класс для разделения файла с вакансиями на файлы по годам публикации и чтения этих файлов.
+    Используется скриптами, которые считают статистику по годам в нескольких процессах
+
+    Attributes:
+        columns_count (int): Количество первых столбцов исходного файла, которые попадают в файлы по годам
+        float_columns (tuple): Столбцы, которые хранятся в файлах parquet числами, остальные - строками
+    """
+    columns_count = 6
+    float_columns = ("salary_from", "salary_to")
+
+    @staticmethod
+    def get_part_name(directory, year, file_format):
+        """
+        Возвращает имя файла за год
+        Args:
+            directory (str): Папка с файлами по годам
+            year (str): Год публикации
+            file_format (str): Формат файла: "csv" или "parquet"
+        Returns:
+            str: Имя файла за год
+        """
+        return os.path.join(directory, f"part_{year}.{file_format}")
+
+    @staticmethod
+    def separate_csv(file_name, directory="csv_files", file_format="csv", chunk_size=100000):
+        """
+        Разделяет исходный CSV-файл на файлы по годам публикации.
+        Исходный файл читается один раз, каждая строка дописывается в файл своего года через буферизованный writer
+        Args:
+            file_name (str): Имя исходного CSV-файла
+            directory (str): Папка, в которую записываются файлы по годам
+            file_format (str): Формат файлов по годам: "csv" или "parquet"
+            chunk_size (int): Количество строк, которые считываются за раз при записи в формате parquet
+        """
+        os.makedirs(directory, exist_ok=True)
+        if file_format == "parquet":
+            YearPartitions.separate_csv_to_parquet(file_name, directory, chunk_size)
+            return
+        files = {}
+        writers = {}
+        try:
+            with open(file_name, encoding="utf_8_sig", newline="") as input_file:
+                reader = csv.reader(input_file)
+                columns = next(reader)
+                published_at_index = columns.index("published_at")
+                for row in reader:
+                    if len(row) == 0:
+                        continue
+                    year = row[published_at_index][0:4]
+                    writer = writers.get(year)
+                    if writer is None:
+                        files[year] = open(YearPartitions.get_part_name(directory, year, file_format), "w",
+                                           encoding="utf_8", newline="", buffering=1 << 20)
+                        writer = writers[year] = csv.writer(files[year])
+                        writer.writerow(columns[:YearPartitions.columns_count])
+                    writer.writerow(row[:YearPartitions.columns_count])
+        finally:
+            for file in files.values():
+                file.close()
+
+    @staticmethod
+    def separate_csv_to_parquet(file_name, directory="csv_files", chunk_size=100000):
+        """
+        Разделяет исходный CSV-файл на файлы parquet по годам публикации.
+        Файл читается частями по chunk_size строк, каждая часть дописывается в файлы своих годов группами строк,
+        поэтому в памяти одновременно находится только одна часть
+        Args:
+            file_name (str): Имя исходного CSV-файла
+            directory (str): Папка, в которую записываются файлы по годам
+            chunk_size (int): Количество строк, которые считываются за раз
+        """
+        with open(file_name, encoding="utf_8_sig", newline="") as input_file:
+            columns = next(csv.reader(input_file))[:YearPartitions.columns_count]
+        # Типы столбцов задаются заранее, чтобы у всех частей была одна схема, даже если в части столбец пустой
+        schema = pa.schema([(column, pa.float64() if column in YearPartitions.float_columns else pa.string())
+                            for column in columns])
+        used_columns = list(dict.fromkeys(columns + ["published_at"]))
+        dtype = {column: "float64" if column in YearPartitions.float_columns else "str" for column in used_columns}
+        writers = {}
+        try:
+            for df in pd.read_csv(file_name, usecols=used_columns, dtype=dtype, encoding="utf_8_sig",
+                                  chunksize=chunk_size):
+                for year, year_df in df[columns].groupby(df["published_at"].str[0:4], sort=False):
+                    writer = writers.get(year)
+                    if writer is None:
+                        writer = writers[year] = pq.ParquetWriter(
+                            YearPartitions.get_part_name(directory, year, "parquet"), schema)
+                    writer.write_table(pa.Table.from_pandas(year_df, schema=schema, preserve_index=False))
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    @staticmethod
+    def read_part(file_name, columns=None):
+        """
+        Считывает файл за отдельно взятый год только с необходимыми столбцами
+        Args:
+            file_name (str): Имя файла за год (.csv или .parquet)
+            columns (list or None): Необходимые столбцы, None - все столбцы
+        Returns:
+            pd.DataFrame: Вакансии за год
+        """
+        if file_name.endswith(".parquet"):
+            return pd.read_parquet(file_name, columns=columns)
+        return pd.read_csv(file_name, usecols=columns)